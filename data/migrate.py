@@ -176,16 +176,20 @@ def load_history(history_path: Path) -> list[dict[str, str | float]]:
 
 
 def initialise_schema(connection: sqlite3.Connection) -> None:
-    """Create the required tables if they do not already exist.
+    """Create the required tables and indexes if they do not already exist.
 
     Inputs:
         connection (sqlite3.Connection): Open database connection with foreign keys enabled.
     Outputs:
-        None directly; executes CREATE TABLE statements in the database.
+        None directly; switches the database file to write-ahead logging (a persistent setting,
+        so runtime connections never need write access to change it) and executes CREATE TABLE
+        and CREATE INDEX statements in the database.
     """
 
     connection.executescript(
         """
+        PRAGMA journal_mode = WAL;
+
         CREATE TABLE IF NOT EXISTS types (
             uuid TEXT PRIMARY KEY NOT NULL,
             type TEXT NOT NULL,
@@ -223,6 +227,8 @@ def initialise_schema(connection: sqlite3.Connection) -> None:
             FOREIGN KEY (subjectID) REFERENCES subjects (uuid) ON DELETE CASCADE ON UPDATE CASCADE,
             FOREIGN KEY (typeID) REFERENCES types (uuid) ON DELETE CASCADE ON UPDATE CASCADE
         );
+
+        CREATE INDEX IF NOT EXISTS idx_history_user_type ON history (userID, typeID);
         """
     )
 
@@ -41,7 +41,7 @@ def get_database_settings() -> dict[str, str | Path]:
 
     Inputs: None.
     Outputs: dict[str, str | Path] containing:
-        - path: Path object pointing to the SQLite database file.
+        - path: Path object pointing to the SQLite database file (a `file:` URI string is also accepted).
         - user_id: str identifier of the active user, sourced from the environment when set.
     """
 
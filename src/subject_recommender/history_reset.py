@@ -8,7 +8,7 @@ from __future__ import annotations
 
 from . import io
 
-_EXCLUDED_TYPES = ("Revision", "Not Studied")
+_EXCLUDED_TYPES = frozenset({"Revision", "Not Studied"})
 
 
 def filter_history() -> int:
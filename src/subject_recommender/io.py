@@ -10,34 +10,44 @@ from __future__ import annotations
 import sqlite3
 import uuid
 from collections.abc import Iterable, Mapping, Sequence
+from functools import lru_cache
 from pathlib import Path
 
 from . import config
 
 
-def _get_database_settings() -> tuple[Path, str]:
+def _get_database_settings() -> tuple[Path | str, str]:
     """Return the configured database path and active user identifier.
 
     Inputs: None.
-    Outputs: tuple[Path, str] describing the SQLite file location and user ID.
+    Outputs: tuple[Path | str, str] describing the SQLite location and user ID. SQLite URIs
+    (strings starting with `file:`, e.g. shared-cache in-memory databases) are returned unchanged.
     """
 
     settings = config.get_database_settings()
-    database_path = Path(settings["path"])
+    raw_path = settings["path"]
+    database_path = raw_path if isinstance(raw_path, str) and raw_path.startswith("file:") else Path(raw_path)
     user_id = str(settings["user_id"])
     return database_path, user_id
 
 
-def _open_connection(database_path: Path) -> sqlite3.Connection:
-    """Create a SQLite connection with foreign keys enforced.
+def _open_connection(database_path: Path | str) -> sqlite3.Connection:
+    """Create a SQLite connection with foreign keys enforced and `synchronous = NORMAL`.
 
-    Inputs: database_path (Path): location of the SQLite database file.
-    Outputs: sqlite3.Connection with row_factory set for dict-like access.
+    Inputs: database_path (Path | str): location of the SQLite database file, or a `file:` URI string.
+    Outputs: sqlite3.Connection with row_factory set for dict-like access. Only connection-local
+    PRAGMAs are set here; the persistent WAL journal mode is applied once by `data/migrate.py`,
+    and with it `synchronous = NORMAL` syncs once per checkpoint rather than on every commit.
     """
 
-    connection = sqlite3.connect(database_path)
+    connection = sqlite3.connect(database_path, uri=isinstance(database_path, str))
     connection.row_factory = sqlite3.Row
-    connection.execute("PRAGMA foreign_keys = ON;")
+    connection.executescript(
+        """
+        PRAGMA foreign_keys = ON;
+        PRAGMA synchronous = NORMAL;
+        """
+    )
     return connection
 
 
@@ -55,7 +65,7 @@ def _get_type_map(connection: sqlite3.Connection, type_names: Iterable[str] | No
 
     if type_names is None:
         rows = connection.execute("SELECT uuid, type FROM types;").fetchall()
-        return {row["type"]: row["uuid"] for row in rows}
+        return {type_name: type_id for type_id, type_name in rows}
 
     wanted = {name.strip() for name in type_names if name}
     placeholder = ",".join("?" for _ in wanted)
@@ -63,7 +73,7 @@ def _get_type_map(connection: sqlite3.Connection, type_names: Iterable[str] | No
         f"SELECT uuid, type FROM types WHERE type IN ({placeholder});",
         tuple(wanted),
     ).fetchall()
-    found = {row["type"]: row["uuid"] for row in rows}
+    found = {type_name: type_id for type_id, type_name in rows}
     missing = sorted(wanted - set(found))
     if missing:
         raise ValueError(f"Missing assessment types in database: {missing}")
@@ -90,7 +100,7 @@ def _get_subject_map(connection: sqlite3.Connection, subject_names: Iterable[str
         f"SELECT uuid, name FROM subjects WHERE name IN ({','.join('?' for _ in names)});",
         tuple(names),
     ).fetchall()
-    found = {row["name"]: row["uuid"] for row in rows}
+    found = {name: subject_id for subject_id, name in rows}
     missing = sorted(names - set(found))
     if missing:
         raise ValueError(f"Missing subjects in database: {missing}")
@@ -106,19 +116,43 @@ def _assert_user_exists(connection: sqlite3.Connection, user_id: str) -> None:
         raise ValueError(f"User '{user_id}' does not exist in the database. Create the user before proceeding.")
 
 
+def invalidate_caches() -> None:
+    """Drop every memoised lookup so the next call re-reads configuration and the database.
+
+    Inputs: None.
+    Outputs: None; clears the cached assessment weights and predicted grades. Call after editing
+    the types or predictedGrades tables outside this module.
+    """
+    _load_assessment_weights.cache_clear()
+    _load_predicted_grades.cache_clear()
+
+
+@lru_cache(maxsize=4)
+def _load_assessment_weights(database_path: Path | str) -> tuple[tuple[str, float], ...]:
+    """Query the assessment type weights for one database, memoised per path.
+
+    Inputs: database_path (Path | str): SQLite location as returned by `_get_database_settings`.
+    Outputs: tuple[tuple[str, float], ...]: Immutable (type name, weight) pairs; empty when the
+    types table has no rows.
+    """
+    with _open_connection(database_path) as connection:
+        rows = connection.execute("SELECT type, weight FROM types;").fetchall()
+
+    return tuple((str(row["type"]), float(row["weight"])) for row in rows)
+
+
 def get_assessment_weights() -> dict[str, float]:
     """Return the weighting per assessment type sourced from the database.
 
     Inputs: None (derives database path and user from configuration).
     Outputs: dict[str, float] mapping assessment names to weights; falls back to config constants
-    when the table is empty.
+    when the table is empty. Query results are cached per database path; see `invalidate_caches`.
     """
     database_path, _ = _get_database_settings()
-    with _open_connection(database_path) as connection:
-        rows = connection.execute("SELECT type, weight FROM types;").fetchall()
+    weights = _load_assessment_weights(database_path)
 
-    if rows:
-        return {str(row["type"]): float(row["weight"]) for row in rows}
+    if weights:
+        return dict(weights)
 
     return {
         "Revision": config.REVISION_WEIGHT,
@@ -148,7 +182,8 @@ def get_session_defaults() -> dict[str, int]:
     """Return session parameters for session generation defaults.
 
     Inputs: None.
-    Outputs: dict[str, int] describing session counts and timings.
+    Outputs: dict[str, int] describing session counts and timings, read from `config` on every
+    call so runtime and test overrides take effect.
     """
     return {
         "count": config.SESSION_COUNT,
@@ -158,16 +193,20 @@ def get_session_defaults() -> dict[str, int]:
     }
 
 
-def get_predicted_grades() -> dict[str, float]:
-    """Load predicted grades for the configured user from SQLite.
+@lru_cache(maxsize=4)
+def _load_predicted_grades(database_path: Path | str, user_id: str) -> tuple[tuple[str, float], ...]:
+    """Query the predicted grades for one database and user, memoised per pair.
 
-    Inputs: Database path and user ID derived from `config.get_database_settings()`.
-    Outputs: dict[str, float] mapping subject names to predicted grade scores.
+    Inputs:
+        database_path (Path | str): SQLite location as returned by `_get_database_settings`.
+        user_id (str): Identifier whose predicted grades are selected.
+    Outputs:
+        tuple[tuple[str, float], ...]: Immutable (subject name, score) pairs so cached results
+        cannot be mutated by callers.
     Raises:
-        ValueError: when no predicted grades are found for the configured user.
+        ValueError: when no predicted grades are found for the user (not cached).
     """
 
-    database_path, user_id = _get_database_settings()
     with _open_connection(database_path) as connection:
         rows = connection.execute(
             """
@@ -182,7 +221,21 @@ def get_predicted_grades() -> dict[str, float]:
     if not rows:
         raise ValueError(f"No predicted grades found for user '{user_id}'.")
 
-    return {str(row["subject_name"]): float(row["score"]) for row in rows}
+    return tuple((str(row["subject_name"]), float(row["score"])) for row in rows)
+
+
+def get_predicted_grades() -> dict[str, float]:
+    """Load predicted grades for the configured user from SQLite.
+
+    Inputs: Database path and user ID derived from `config.get_database_settings()`.
+    Outputs: dict[str, float] mapping subject names to predicted grade scores. Query results are
+    cached per (database path, user ID) because the application never writes predicted grades;
+    call `invalidate_caches()` after editing them out of band.
+    Raises:
+        ValueError: when no predicted grades are found for the configured user.
+    """
+
+    return dict(_load_predicted_grades(*_get_database_settings()))
 
 
 def get_study_history() -> list[dict[str, str | float]]:
@@ -223,12 +276,63 @@ def get_study_history() -> list[dict[str, str | float]]:
     ]
 
 
-def append_history_entries(entries: Sequence[Mapping[str, str | float]]) -> int:
+def _insert_history_rows(
+    connection: sqlite3.Connection, user_id: str, entries: Sequence[Mapping[str, str | float]]
+) -> int:
+    """Insert history rows for `user_id` on an open connection without committing.
+
+    Inputs:
+        connection (sqlite3.Connection): Active database connection.
+        user_id (str): Identifier of the user owning the entries.
+        entries (Sequence[Mapping[str, str | float]]): History entry dictionaries.
+    Outputs:
+        int: Number of history rows inserted.
+    Raises:
+        ValueError: when required assessment types, subjects, or the user are missing.
+    """
+
+    _assert_user_exists(connection, user_id)
+    subjects = {str(entry.get("subject", "")).strip() for entry in entries if entry.get("subject")}
+    types = {str(entry.get("type", "")).strip() for entry in entries if entry.get("type")}
+
+    type_ids = _get_type_map(connection, types)
+    subject_ids = _get_subject_map(connection, subjects)
+
+    rows: list[tuple[str, str, str, str, float, str]] = []
+    for entry in entries:
+        subject = str(entry.get("subject", "")).strip()
+        type_name = str(entry.get("type", "")).strip()
+        score = float(entry.get("score", 0.0))
+        date_value = str(entry.get("date", ""))
+        if not subject or not type_name:
+            continue
+        subject_id = subject_ids[subject]
+        type_id = type_ids[type_name]
+        history_id = str(uuid.uuid4())
+        rows.append((history_id, user_id, subject_id, type_id, score, date_value))
+
+    if rows:
+        connection.executemany(
+            """
+            INSERT INTO history (historyEntryID, userID, subjectID, typeID, score, studied_at)
+            VALUES (?, ?, ?, ?, ?, ?);
+            """,
+            rows,
+        )
+    return len(rows)
+
+
+def append_history_entries(
+    entries: Sequence[Mapping[str, str | float]], connection: sqlite3.Connection | None = None
+) -> int:
     """Persist history entries for the configured user, creating subjects as required.
 
     Inputs:
         entries (Sequence[Mapping[str, str | float]]): Iterable of history entry dictionaries containing
             `subject`, `type`, `score`, and `date` keys.
+        connection (sqlite3.Connection | None): Optional open connection to write through. When
+            supplied, the rows join the caller's transaction and committing is left to the caller;
+            otherwise a connection to the configured database is opened and committed here.
     Outputs:
         int: Number of history rows written to the database.
     Raises:
@@ -239,40 +343,14 @@ def append_history_entries(entries: Sequence[Mapping[str, str | float]]) -> int:
         return 0
 
     database_path, user_id = _get_database_settings()
-    with _open_connection(database_path) as connection:
-        _assert_user_exists(connection, user_id)
-        subjects = {str(entry.get("subject", "")).strip() for entry in entries if entry.get("subject")}
-        types = {str(entry.get("type", "")).strip() for entry in entries if entry.get("type")}
-
-        type_ids = _get_type_map(connection, types)
-        subject_ids = _get_subject_map(connection, subjects)
-
-        rows: list[tuple[str, str, str, str, float, str]] = []
-        for entry in entries:
-            subject = str(entry.get("subject", "")).strip()
-            type_name = str(entry.get("type", "")).strip()
-            score = float(entry.get("score", 0.0))
-            date_value = str(entry.get("date", ""))
-            if not subject or not type_name:
-                continue
-            subject_id = subject_ids[subject]
-            type_id = type_ids[type_name]
-            history_id = str(uuid.uuid4())
-            rows.append((history_id, user_id, subject_id, type_id, score, date_value))
-
-        if not rows:
-            return 0
+    if connection is not None:
+        return _insert_history_rows(connection, user_id, entries)
 
-        connection.executemany(
-            """
-            INSERT INTO history (historyEntryID, userID, subjectID, typeID, score, studied_at)
-            VALUES (?, ?, ?, ?, ?, ?);
-            """,
-            rows,
-        )
-        connection.commit()
+    with _open_connection(database_path) as owned_connection:
+        written = _insert_history_rows(owned_connection, user_id, entries)
+        owned_connection.commit()
 
-    return len(rows)
+    return written
 
 
 def delete_history_by_types(type_names: Iterable[str]) -> int:
@@ -12,23 +12,6 @@ from .. import io
 from .weighting import WeightedHistory
 
 
-def calculate_weighted_averages(weighted_history: WeightedHistory) -> dict[str, float]:
-    """Return average scores per subject derived from weighted totals.
-
-    Inputs: weighted_history (WeightedHistory): mapping of subject names to their weighted scores
-    and accumulated weights.
-    Outputs: dict[str, float]: per-subject averages, defaulting to zero when no weight exists.
-    """
-    averages: dict[str, float] = {}
-
-    for subject, totals in weighted_history.items():
-        weighted_total = float(totals.get("weighted", 0.0))
-        weight_total = float(totals.get("weight", 0.0))
-        averages[subject] = (weighted_total / weight_total) if weight_total else 0.0
-
-    return averages
-
-
 def aggregate_scores(weighted_history: WeightedHistory) -> dict[str, float]:
     """Return floored per-subject scores derived from weighted history.
 
@@ -38,14 +21,19 @@ def aggregate_scores(weighted_history: WeightedHistory) -> dict[str, float]:
     the weighted result when available, otherwise falling back to predicted grades.
     """
     predicted_grades = io.get_predicted_grades()
-    weighted_averages = calculate_weighted_averages(weighted_history)
     aggregated: dict[str, float] = {}
 
+    # Only predicted subjects are reported, so averages are taken here rather than for every
+    # weighted subject up front.
     for subject, predicted_grade in predicted_grades.items():
-        subject_totals = weighted_history.get(subject, {})
-        weight_total = float(subject_totals.get("weight", 0.0)) if isinstance(subject_totals, dict) else 0.0
-        result_average = weighted_averages.get(subject, 0.0)
-        combined_score = result_average if weight_total > 0 else float(predicted_grade)
+        subject_totals = weighted_history.get(subject)
+        if not isinstance(subject_totals, dict):
+            subject_totals = {}
+        weight_total = float(subject_totals.get("weight", 0.0))
+        if weight_total > 0:
+            combined_score = float(subject_totals.get("weighted", 0.0)) / weight_total
+        else:
+            combined_score = float(predicted_grade)
 
         aggregated[subject] = floor(combined_score * 100) / 100
 
@@ -20,8 +20,9 @@ def normalise_scores(
     if predicted_grades is None:
         predicted_grades = io.get_predicted_grades()
 
-    total = sum(predicted_grades.values()) or 1.0
-    return {subject: score / total for subject, score in predicted_grades.items()}
+    # One reciprocal, then a multiply per subject; a zero total leaves every score unchanged.
+    inverse_total = 1.0 / (sum(predicted_grades.values()) or 1.0)
+    return {subject: score * inverse_total for subject, score in predicted_grades.items()}
 
 
 def choose_lowest_subject(normalised_scores: dict[str, float]) -> str:
@@ -32,4 +33,4 @@ def choose_lowest_subject(normalised_scores: dict[str, float]) -> str:
     """
     if not normalised_scores:
         raise ValueError("normalised_scores cannot be empty")
-    return min(normalised_scores, key=lambda subject: normalised_scores[subject])
+    return min(normalised_scores, key=normalised_scores.__getitem__)
@@ -25,34 +25,47 @@ HistoryEntry = Mapping[str, float | str]
 WeightedHistory = dict[str, dict[str, float]]  # {"subject": {"weighted": float, "weight": float}}
 
 
-def _calculate_date_weight(entry_date: str, weighting_config: dict[str, float | int], reference_date: date) -> float:
+def _parse_entry_date(entry_date: str) -> date | None:
+    """Return the calendar date of an ISO (YYYY-MM-DD) string, or None when it cannot be parsed.
+
+    Inputs: entry_date (str): Date string stored against a history entry.
+    Outputs: date | None: Parsed date, or None for missing or malformed values.
+    """
+    try:
+        # Stored dates are zero-padded ISO strings, which the C `fromisoformat` parses far faster
+        # than `strptime`; anything else keeps the lenient `strptime` behaviour.
+        if len(entry_date) == 10 and entry_date[4] == "-" and entry_date[7] == "-":
+            return date.fromisoformat(entry_date)
+        return datetime.strptime(entry_date, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _calculate_date_weight(
+    entry_date: str, reference_date: date, min_weight: float, max_weight: float, decay_window: int
+) -> float:
     """Return a decay factor based on how old a history entry is.
 
     Inputs:
         entry_date (str): ISO formatted date string (YYYY-MM-DD) for the entry.
-        weighting_config (dict[str, float | int]): Mapping containing `min_weight`,
-            `max_weight`, and `zero_day_threshold` bounds sourced from configuration.
         reference_date (date): The date to measure entry age against.
+        min_weight (float): Multiplier applied once the entry reaches `decay_window` days.
+        max_weight (float): Multiplier applied to future-dated, missing, or malformed dates.
+        decay_window (int): Positive number of days over which the weight decays.
     Outputs:
-        float: Date-derived multiplier clamped between configured min and max weights.
+        float: Date-derived multiplier clamped between `min_weight` and `max_weight`.
     """
-    try:
-        parsed_date = datetime.strptime(entry_date, "%Y-%m-%d").date()
-    except (TypeError, ValueError):
-        return float(weighting_config["max_weight"])
+    parsed_date = _parse_entry_date(entry_date)
+    if parsed_date is None:
+        return max_weight
 
     age_days = (reference_date - parsed_date).days
-    decay_window = max(1, int(weighting_config["zero_day_threshold"]))
-    min_weight = float(weighting_config["min_weight"])
-    max_weight = float(weighting_config["max_weight"])
-
     if age_days >= decay_window:
         return min_weight
     if age_days <= 0:
         return max_weight
 
-    span = max_weight - min_weight
-    scaled_weight = max_weight - (span * (age_days / decay_window))
+    scaled_weight = max_weight - ((max_weight - min_weight) * (age_days / decay_window))
     return max(min_weight, min(max_weight, scaled_weight))
 
 
@@ -70,36 +83,35 @@ def apply_weighting(history: Iterable[HistoryEntry]) -> WeightedHistory:
     assessment_weights = io.get_assessment_weights()
     date_weighting = io.get_date_weighting()
     predicted_grades = io.get_predicted_grades()
-    totals: defaultdict[str, dict[str, float]] = defaultdict(lambda: {"weighted": 0.0, "weight": 0.0})
+    weighted_sums: defaultdict[str, float] = defaultdict(float)
+    weight_sums: defaultdict[str, float] = defaultdict(float)
     today = date.today()
+    lookup_weight = assessment_weights.get
+    # Non-positive scores fall back to the predicted grade; resolve that weight once per subject.
+    fallback_weights = {subject: floor(100 * (1.0 - grade)) for subject, grade in predicted_grades.items()}
+    lookup_fallback = fallback_weights.get
+    default_fallback_weight = floor(100 * (1.0 - 0.1))
+    min_date_weight = float(date_weighting["min_weight"])
+    max_date_weight = float(date_weighting["max_weight"])
+    decay_window = max(1, int(date_weighting["zero_day_threshold"]))
 
     for entry in history:
         subject = str(entry.get("subject"))
         score = float(entry.get("score", 0.0))
-        assessment_type = entry.get("type")
-
-        weight = assessment_weights.get(str(assessment_type), 0.0)
 
         if score > 0:
-            weight *= 100 - score
-            # print("POSITIVE - " + str(weight))
+            weight = lookup_weight(str(entry.get("type")), 0.0) * (100 - score)
         else:
-            predicted_grade = predicted_grades.get(subject, 0.1)
-            prediction_delta = 1.0 - predicted_grade
-            weight = floor(100 * prediction_delta)
-            # if subject == "History":
-            #     print("HIST - " + str(prediction_delta))
-            #     print("HIST - " + str((100 * prediction_delta)))
-            #     print("HIST - " + str(weight))
-            # if subject == "Chemistry":
-            #     print("CHEM - " + str(prediction_delta))
-            #     print("CHEM - " + str((100 * prediction_delta)))
-            #     print("CHEM - " + str(weight))
-
-        date_weight = _calculate_date_weight(str(entry.get("date", "")), date_weighting, today)
-        weight *= date_weight
-
-        totals[subject]["weighted"] += score * weight
-        totals[subject]["weight"] += weight
-
-    return dict(totals)
+            weight = lookup_fallback(subject, default_fallback_weight)
+
+        weight *= _calculate_date_weight(
+            str(entry.get("date", "")), today, min_date_weight, max_date_weight, decay_window
+        )
+
+        weighted_sums[subject] += score * weight
+        weight_sums[subject] += weight
+
+    return {
+        subject: {"weighted": weighted_total, "weight": weight_sums[subject]}
+        for subject, weighted_total in weighted_sums.items()
+    }
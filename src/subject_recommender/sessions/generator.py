@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import math
 import random
+import sys
 from collections import Counter
 from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
@@ -19,6 +20,9 @@ from math import sin
 from .. import io, preprocessing
 from ..preprocessing.weighting import HistoryEntry
 
+# Low-cardinality labels interned on ingestion so hot-loop dict and set lookups hit cached hashes.
+_INTERNED_FIELDS = ("subject", "type")
+
 
 @dataclass(slots=True)
 class SessionPlan:
@@ -26,20 +30,49 @@ class SessionPlan:
 
     Attributes:
         subjects: Shuffled list[str] representing which subject to study per session.
-        new_entries: list[dict[str, str | float]] describing synthetic history rows.
+        revision_entries: list[dict[str, str | float]] of synthetic "Revision" rows, in session order.
+        penalty_entries: list[dict[str, str | float]] of synthetic "Not Studied" rows.
         history: list[dict[str, str | float]] representing the base history plus new entries.
     """
 
     subjects: list[str]
-    new_entries: list[dict[str, str | float]]
+    revision_entries: list[dict[str, str | float]]
+    penalty_entries: list[dict[str, str | float]]
     history: list[dict[str, str | float]]
 
+    @property
+    def new_entries(self) -> list[dict[str, str | float]]:
+        """Return every synthetic history row generated for this plan.
+
+        Inputs: None (reads `revision_entries` and `penalty_entries`).
+        Outputs: New list[dict[str, str | float]] of revision entries followed by penalty entries.
+        """
+        return [*self.revision_entries, *self.penalty_entries]
+
+
+@dataclass(frozen=True, slots=True)
+class _SessionTimings:
+    """Per-run constants derived once from the resolved session parameters.
+
+    Attributes:
+        count: Number of sessions scheduled per shot.
+        session_span: Session plus break minutes; scales revision and penalty scores.
+        studied_delta: Local score increase applied to the subject just studied.
+        not_studied_delta: Local score decrease applied to every other subject.
+    """
+
+    count: int
+    session_span: int
+    studied_delta: float
+    not_studied_delta: float
+
 
 def generate_session_plan(
     history: Sequence[HistoryEntry] | None = None,
     session_parameters: Mapping[str, int] | None = None,
     session_date: str | None = None,
     shots: int | None = None,
+    rng: random.Random | None = None,
 ) -> list[SessionPlan]:
     """Return one or more study plans, optionally running multiple shots per invocation.
 
@@ -48,21 +81,28 @@ def generate_session_plan(
         session_parameters: Mapping with `count`, `session_time`, `break_time`, and optionally `shots`.
         session_date: Optional ISO-formatted date string for new entries (defaults to today).
         shots: Optional override controlling how many sequential plans to generate.
+        rng: Optional random generator used to shuffle subject output; seed it for reproducible runs.
     Outputs:
         list[SessionPlan] ordered by shot execution.
     """
     local_history = _prepare_history(history)
     parameters = _resolve_session_parameters(session_parameters)
+    timings = _resolve_session_timings(parameters)
     shot_count = shots if shots is not None else parameters.get("shots", 1)
     shot_count = max(int(shot_count or 1), 1)
     run_date = session_date or date.today().isoformat()
+    # Shared across shots: later shots only ever add subjects chosen earlier in the run.
+    tracked_subjects = _collect_subjects(local_history)
+    shuffle_rng = rng if rng is not None else random.Random()
 
     plans: list[SessionPlan] = []
     for _ in range(shot_count):
         plan = _run_single_plan(
             local_history=local_history,
-            session_parameters=parameters,
+            timings=timings,
             session_date=run_date,
+            tracked_subjects=tracked_subjects,
+            rng=shuffle_rng,
         )
         plans.append(plan)
 
@@ -73,21 +113,35 @@ def _prepare_history(history: Sequence[HistoryEntry] | None) -> list[dict[str, s
     """Return a mutable copy of the supplied or persisted study history.
 
     Inputs: Optional sequence of history entries; falls back to `io.get_study_history`.
-    Outputs: list of dictionaries safe to mutate within the generator.
+    Outputs: list of dictionaries safe to mutate within the generator, with subject and type
+    labels interned.
     """
     source_history = history if history is not None else io.get_study_history()
-    return [dict(entry) for entry in source_history]
+    prepared: list[dict[str, str | float]] = []
+    for entry in source_history:
+        copied = dict(entry)
+        for field in _INTERNED_FIELDS:
+            value = copied.get(field)
+            if isinstance(value, str):
+                copied[field] = sys.intern(value)
+        prepared.append(copied)
+    return prepared
 
 
 def _resolve_session_parameters(
     overrides: Mapping[str, int] | None,
-) -> dict[str, int]:
+) -> Mapping[str, int]:
     """Merge overrides with configuration defaults for session generation.
 
     Inputs: Optional mapping overriding `count`, `session_time`, and `break_time`.
-    Outputs: Dict containing the resolved integer values for each parameter.
+    Outputs: Mapping containing the resolved integer values for each parameter; the defaults
+    mapping is returned as-is when there is nothing to merge.
     """
-    parameters = dict(io.get_session_defaults())
+    defaults = io.get_session_defaults()
+    if not overrides and "shots" in defaults:
+        return defaults
+
+    parameters = dict(defaults)
 
     if overrides:
         for key in ("count", "session_time", "break_time", "shots"):
@@ -100,25 +154,41 @@ def _resolve_session_parameters(
     return parameters
 
 
+def _resolve_session_timings(parameters: Mapping[str, int]) -> _SessionTimings:
+    """Evaluate the timing-derived constants shared by every session in a run.
+
+    Inputs: parameters (Mapping[str, int]): resolved `count`, `session_time`, and `break_time`.
+    Outputs: _SessionTimings holding the session count, session span, and local score deltas.
+    """
+    session_time = int(parameters["session_time"])
+    break_time = int(parameters["break_time"])
+    studied_delta, not_studied_delta = _calculate_score_deltas(session_time, break_time)
+    return _SessionTimings(
+        count=max(int(parameters["count"]), 0),
+        session_span=session_time + break_time,
+        studied_delta=studied_delta,
+        not_studied_delta=not_studied_delta,
+    )
+
+
 def _build_revision_entry(
     subject: str,
-    session_time: int,
-    break_time: int,
+    session_span: int,
     session_date: str,
+    predicted_grades: Mapping[str, float],
 ) -> dict[str, str | float]:
     """Create the synthetic revision entry appended after each session.
 
     Inputs:
         subject: The subject label selected by the pipeline.
-        session_time: Duration of the study slot (minutes).
-        break_time: Break duration (minutes) to subtract from the score.
+        session_span: Session plus break duration (minutes) scaling the score.
         session_date: ISO formatted date string to record against the entry.
+        predicted_grades: Predicted grade mapping loaded once for the current shot.
     Outputs: Dictionary representing the history entry consumed by preprocessing.
     """
-    predicted_grades = io.get_predicted_grades()
     predicted_grade = float(predicted_grades.get(subject, 0.0))
     x = math.fabs(predicted_grade - 1) * 2 * math.pi
-    revision_score = float((sin(x / 4 + math.pi / 2)) * (session_time + break_time))
+    revision_score = float((sin(x / 4 + math.pi / 2)) * session_span)
     return {
         "subject": subject,
         "type": "Revision",
@@ -138,26 +208,33 @@ def _initialise_local_scores(history: Sequence[HistoryEntry]) -> dict[str, float
     return {subject: score / 100 for subject, score in aggregated.items()}
 
 
+def _calculate_score_deltas(session_time: int, break_time: int) -> tuple[float, float]:
+    """Return the local score adjustments applied after each session.
+
+    Inputs: session_time and break_time (minutes) for the current run.
+    Outputs: tuple[float, float] of (studied_delta, not_studied_delta); constant for a whole shot.
+    """
+    return 0.005 * (2.5 * session_time + break_time), 0.005
+
+
 def _adjust_local_scores(
     local_scores: dict[str, float],
     chosen_subject: str,
-    session_time: int,
-    break_time: int,
+    studied_delta: float,
+    not_studied_delta: float,
 ) -> None:
     """Mutate the local score dictionary to discourage repeated selections.
 
-    Inputs: Local score mapping used for subject selection, the chosen subject identifier,
-    and the session timings (minutes).
+    Inputs: Local score mapping used for subject selection, the chosen subject identifier (a key
+    of `local_scores`), and the precomputed deltas from `_calculate_score_deltas`.
     Outputs: None (side-effect updates `local_scores` in place).
     """
-    studied_delta = 0.005 * (2.5 * session_time + break_time)
-    not_studied_delta = 0.005
-
-    for subject in local_scores:
-        if subject == chosen_subject:
-            local_scores[subject] += studied_delta
-        else:
-            local_scores[subject] = max(local_scores[subject] - not_studied_delta, 0.0)
+    # Decay every subject (floored at zero) in one sweep, then overwrite the chosen subject with its
+    # pre-decay score plus the studied bump.
+    chosen_score = local_scores[chosen_subject]
+    for subject, score in local_scores.items():
+        local_scores[subject] = max(score - not_studied_delta, 0.0)
+    local_scores[chosen_subject] = chosen_score + studied_delta
 
 
 def _collect_subjects(history: Sequence[HistoryEntry]) -> set[str]:
@@ -166,7 +243,7 @@ def _collect_subjects(history: Sequence[HistoryEntry]) -> set[str]:
     Inputs: history (Sequence[HistoryEntry]): entries containing subject identifiers.
     Outputs: set[str]: unique, non-empty subject labels pulled from history and predictions.
     """
-    subjects = {str(entry.get("subject", "")).strip() for entry in history if entry.get("subject")}
+    subjects = {sys.intern(str(entry.get("subject", "")).strip()) for entry in history if entry.get("subject")}
     subjects.update(io.get_predicted_grades().keys())
     return {subject for subject in subjects if subject}
 
@@ -180,39 +257,37 @@ def _calculate_predicted_grades_from_history(
     Outputs: dict[str, float]: mapping of subjects to predicted grades scaled between zero and one,
     ignoring negative scores and applying assessment weighting factors.
     """
-    assessment_weights = io.get_assessment_weights()
-    totals: dict[str, float] = {}
-    weight_totals: dict[str, float] = {}
-    tracked_subjects: set[str] = set()
+    assessment_weights = {name: float(weight) for name, weight in io.get_assessment_weights().items()}
+    # Per-subject [weighted score total, weight total], so each row costs a single dict lookup.
+    totals: dict[str, list[float]] = {}
 
     for entry in history:
         subject = str(entry.get("subject", "")).strip()
         if not subject:
             continue
-        tracked_subjects.add(subject)
+        subject_totals = totals.get(subject)
+        if subject_totals is None:
+            subject_totals = totals[subject] = [0.0, 0.0]
         score = float(entry.get("score", 0.0))
         if score < 0:
             continue
-        assessment_type = str(entry.get("type", "")).strip()
-        weight = float(assessment_weights.get(assessment_type, 0.0))
+        weight = assessment_weights.get(str(entry.get("type", "")).strip(), 0.0)
         if weight <= 0:
             continue
-        totals[subject] = totals.get(subject, 0.0) + (score * weight)
-        weight_totals[subject] = weight_totals.get(subject, 0.0) + weight
-
-    predicted_grades: dict[str, float] = {}
-    for subject in sorted(tracked_subjects):
-        average_score = totals.get(subject, 0.0) / max(weight_totals.get(subject, 0.0), 1.0)
-        predicted_grades[subject] = max(min(average_score / 100, 1.0), 0.0)
+        subject_totals[0] += score * weight
+        subject_totals[1] += weight
 
-    return predicted_grades
+    return {
+        subject: max(min(weighted_total / max(weight_total, 1.0) / 100, 1.0), 0.0)
+        for subject, (weighted_total, weight_total) in sorted(totals.items())
+    }
 
 
 def _build_not_studied_entries(
     tracked_subjects: set[str],
     studied_subjects: Counter[str],
-    session_time: int,
-    break_time: int,
+    predicted_grades: Mapping[str, float],
+    session_span: int,
     session_date: str,
 ) -> list[dict[str, str | float]]:
     """Return penalty entries for subjects not selected in the generated plan.
@@ -220,12 +295,11 @@ def _build_not_studied_entries(
     Inputs:
         tracked_subjects: All subjects known from history and prediction datasets.
         studied_subjects: Counter tracking subjects chosen during this plan run.
-        session_time: Duration of the study session in minutes.
-        break_time: Break duration in minutes used to scale the penalty.
+        predicted_grades: Predicted grade mapping loaded once for the current shot.
+        session_span: Session plus break duration (minutes) used to scale the penalty.
         session_date: ISO-formatted date marking when the penalty is applied.
     Outputs: list[dict[str, str | float]] containing negative scoring entries.
     """
-    predicted_grades = io.get_predicted_grades()
     entries: list[dict[str, str | float]] = []
 
     for subject in sorted(tracked_subjects):
@@ -234,7 +308,7 @@ def _build_not_studied_entries(
             continue
         predicted_grade = float(predicted_grades.get(subject, 0.0))
         x = (1 - predicted_grade) * math.pi
-        penalty_score = float(-sin(x) * (session_time + break_time))
+        penalty_score = float(-sin(x) * session_span)
         entries.append(
             {
                 "subject": subject,
@@ -247,14 +321,16 @@ def _build_not_studied_entries(
     return entries
 
 
-def _shuffle_subjects(subjects: list[str]) -> list[str]:
+def _shuffle_subjects(subjects: list[str], rng: random.Random) -> list[str]:
     """Return a shuffled copy of the supplied subjects list for output display.
 
-    Inputs: subjects (list[str]): ordered subjects selected during plan generation.
+    Inputs:
+        subjects (list[str]): ordered subjects selected during plan generation.
+        rng (random.Random): generator instance owned by the current run.
     Outputs: list[str]: shuffled copy to reduce positional predictability.
     """
     shuffled = list(subjects)
-    random.shuffle(shuffled)
+    rng.shuffle(shuffled)
     return shuffled
 
 
@@ -272,61 +348,65 @@ def _persist_history(new_entries: Sequence[dict[str, str | float]]) -> None:
 
 def _run_single_plan(
     local_history: list[dict[str, str | float]],
-    session_parameters: Mapping[str, int],
+    timings: _SessionTimings,
     session_date: str,
+    tracked_subjects: set[str],
+    rng: random.Random,
 ) -> SessionPlan:
     """Execute the scheduling workflow for a single shot.
 
     Inputs:
         local_history: Mutable copy of the persisted or supplied study history.
-        session_parameters: Mapping defining `count`, `session_time`, and `break_time`.
+        timings: Per-run constants from `_resolve_session_timings`.
         session_date: ISO-formatted date string used for synthetic entries.
+        tracked_subjects: Subjects known across the run; updated in place with chosen subjects.
+        rng: Random generator used to shuffle the subjects stored on the plan.
     Outputs: SessionPlan object containing ordered subjects and appended history rows.
     """
-    session_count = max(int(session_parameters["count"]), 0)
-    session_time = int(session_parameters["session_time"])
-    break_time = int(session_parameters["break_time"])
-
     local_scores = _initialise_local_scores(local_history)
-    tracked_subjects = _collect_subjects(local_history)
+    predicted_grades = io.get_predicted_grades()
 
     subjects: list[str] = []
     session_entries: list[dict[str, str | float]] = []
 
-    for _ in range(session_count):
-        normalised_scores = preprocessing.normalisation.normalise_scores(local_scores)
-        subject = preprocessing.normalisation.choose_lowest_subject(normalised_scores)
+    for _ in range(timings.count):
+        # Dividing by a positive total keeps the order, so only a negative total (once penalties
+        # dominate) needs the normalisation pass, which reverses the order of the raw scores.
+        if sum(local_scores.values()) < 0:
+            selection_scores = preprocessing.normalisation.normalise_scores(local_scores)
+        else:
+            selection_scores = local_scores
+        subject = preprocessing.normalisation.choose_lowest_subject(selection_scores)
         subjects.append(subject)
         tracked_subjects.add(subject)
-
         entry = _build_revision_entry(
             subject=subject,
-            session_time=session_time,
-            break_time=break_time,
+            session_span=timings.session_span,
             session_date=session_date,
+            predicted_grades=predicted_grades,
         )
         local_history.append(entry)
         session_entries.append(entry)
         _adjust_local_scores(
             local_scores=local_scores,
             chosen_subject=subject,
-            session_time=session_time,
-            break_time=break_time,
+            studied_delta=timings.studied_delta,
+            not_studied_delta=timings.not_studied_delta,
         )
 
     not_studied_entries = _build_not_studied_entries(
         tracked_subjects=tracked_subjects,
         studied_subjects=Counter(subjects),
-        session_time=session_time,
-        break_time=break_time,
+        predicted_grades=predicted_grades,
+        session_span=timings.session_span,
         session_date=session_date,
     )
     local_history.extend(not_studied_entries)
-    persisted_entries = session_entries + not_studied_entries
 
     plan = SessionPlan(
-        subjects=_shuffle_subjects(subjects),
-        new_entries=[dict(entry) for entry in persisted_entries],
+        subjects=_shuffle_subjects(subjects, rng),
+        revision_entries=session_entries,
+        penalty_entries=not_studied_entries,
         history=[dict(entry) for entry in local_history],
     )
     _persist_history(plan.new_entries)
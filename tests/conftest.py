@@ -6,29 +6,61 @@ Outputs: Auto-used fixtures that supply temporary datasets and patch configurati
 
 from __future__ import annotations
 
+import os
 import sqlite3
-from collections.abc import Iterable
-from pathlib import Path
+import uuid
+from collections.abc import Iterator, Sequence
+from itertools import chain
+from typing import Final
 
 import pytest
 
-from subject_recommender import config
+from subject_recommender import config, io
 
+# pytest-xdist sets this per worker process; naming databases after it keeps `-n auto` runs apart.
+_WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "master")
 
-@pytest.fixture(autouse=True)
-def temporary_database(monkeypatch: pytest.MonkeyPatch, tmp_path_factory: pytest.TempPathFactory) -> Path:
-    """Create and configure an isolated SQLite database for all tests.
+_USER_SEEDS: Final[tuple[tuple[str, str, str], ...]] = (("fixture-user", "tester", "student"),)
+_TYPE_SEEDS: Final[tuple[tuple[str, str, float], ...]] = (
+    ("type-revision", "Revision", 0.1),
+    ("type-homework", "Homework", 0.2),
+    ("type-quiz", "Quiz", 0.3),
+    ("type-topic", "Topic Test", 0.4),
+    ("type-mock", "Mock Exam", 0.5),
+    ("type-exam", "Exam", 0.6),
+    ("type-not-studied", "Not Studied", 0.0),
+)
+_SUBJECT_SEEDS: Final[tuple[tuple[str, str], ...]] = (("sub-maths", "Maths"),)
+_PREDICTED_GRADE_SEEDS: Final[tuple[tuple[str, str, str, float], ...]] = (("pred-1", "fixture-user", "sub-maths", 0.5),)
+_HISTORY_SEEDS: Final[tuple[tuple[str, str, str, str, int, str], ...]] = (
+    ("hist-1", "fixture-user", "sub-maths", "type-quiz", 50, "2025-01-01"),
+)
+
+
+def _insert_rows(connection: sqlite3.Connection, insert: str, rows: Sequence[tuple[object, ...]]) -> None:
+    """Insert every row through one compound `VALUES` statement.
+
+    Inputs: connection (sqlite3.Connection): open database handle; insert (str): `INSERT INTO table (columns)`
+    prefix; rows (Sequence[tuple[object, ...]]): equally sized parameter tuples.
+    Outputs: None; a single statement is prepared and executed for all rows.
+    """
+
+    placeholders = "(" + ", ".join("?" * len(rows[0])) + ")"
+    connection.execute(f"{insert} VALUES {', '.join([placeholders] * len(rows))};", tuple(chain.from_iterable(rows)))
 
-    Inputs: `monkeypatch` for swapping module attributes and `tmp_path_factory` for generating a temporary folder.
-    Outputs: Path to the created database file with core tables and seed data populated.
+
+@pytest.fixture(scope="session")
+def database_template() -> Iterator[sqlite3.Connection]:
+    """Build the schema and seed rows once per test session in a private in-memory database.
+
+    Inputs: None.
+    Outputs: Open connection to the seeded template; each test copies its pages into a fresh
+    database through the SQLite backup API instead of replaying the DDL and inserts.
     """
 
-    data_dir = tmp_path_factory.mktemp("data")
-    db_path = Path(data_dir, "database.sqlite")
-    connection = sqlite3.connect(db_path)
+    connection = sqlite3.connect(":memory:", isolation_level=None)
     connection.executescript(
         """
-        PRAGMA foreign_keys = ON;
         CREATE TABLE users (uuid TEXT PRIMARY KEY NOT NULL, username TEXT NOT NULL, role TEXT NOT NULL);
         CREATE TABLE subjects (uuid TEXT PRIMARY KEY NOT NULL, name TEXT NOT NULL);
         CREATE TABLE types (uuid TEXT PRIMARY KEY NOT NULL, type TEXT NOT NULL, weight REAL NOT NULL);
@@ -51,35 +83,58 @@ def temporary_database(monkeypatch: pytest.MonkeyPatch, tmp_path_factory: pytest
             FOREIGN KEY (subjectID) REFERENCES subjects (uuid),
             FOREIGN KEY (typeID) REFERENCES types (uuid)
         );
+        CREATE INDEX idx_history_user_type ON history (userID, typeID);
         """
     )
 
-    connection.execute("INSERT INTO users (uuid, username, role) VALUES ('fixture-user', 'tester', 'student');")
-
-    type_seeds: Iterable[tuple[str, str, float]] = (
-        ("type-revision", "Revision", 0.1),
-        ("type-homework", "Homework", 0.2),
-        ("type-quiz", "Quiz", 0.3),
-        ("type-topic", "Topic Test", 0.4),
-        ("type-mock", "Mock Exam", 0.5),
-        ("type-exam", "Exam", 0.6),
-        ("type-not-studied", "Not Studied", 0.0),
-    )
-    connection.executemany("INSERT INTO types (uuid, type, weight) VALUES (?, ?, ?);", type_seeds)
-
-    connection.execute("INSERT INTO subjects (uuid, name) VALUES ('sub-maths', 'Maths');")
-    connection.execute(
-        """INSERT INTO predictedGrades (predictedGradeID, userID, subjectID, score) 
-        VALUES ('pred-1','fixture-user','sub-maths',0.5);"""
+    # Autocommit connection plus one explicit transaction so every seed row lands in a single commit.
+    connection.execute("BEGIN;")
+    _insert_rows(connection, "INSERT INTO users (uuid, username, role)", _USER_SEEDS)
+    _insert_rows(connection, "INSERT INTO types (uuid, type, weight)", _TYPE_SEEDS)
+    _insert_rows(connection, "INSERT INTO subjects (uuid, name)", _SUBJECT_SEEDS)
+    _insert_rows(
+        connection,
+        "INSERT INTO predictedGrades (predictedGradeID, userID, subjectID, score)",
+        _PREDICTED_GRADE_SEEDS,
     )
-    connection.execute(
-        "INSERT INTO history (historyEntryID, userID, subjectID, typeID, score, studied_at) VALUES "
-        "('hist-1','fixture-user','sub-maths','type-quiz',50,'2025-01-01');"
+    _insert_rows(
+        connection,
+        "INSERT INTO history (historyEntryID, userID, subjectID, typeID, score, studied_at)",
+        _HISTORY_SEEDS,
     )
-    connection.commit()
+    connection.execute("COMMIT;")
+
+    yield connection
     connection.close()
 
-    monkeypatch.setattr(config, "DATABASE_PATH", db_path)
+
+@pytest.fixture(autouse=True)
+def temporary_database(
+    monkeypatch: pytest.MonkeyPatch, database_template: sqlite3.Connection
+) -> Iterator[sqlite3.Connection]:
+    """Point configuration at a fresh copy of the seeded template for the current test.
+
+    Inputs: `monkeypatch` for swapping module attributes and the session-wide `database_template`.
+    Outputs: Live connection holding the shared-cache copy that `config.DATABASE_PATH` points at, so
+    tests can query it without reopening. Teardown closes it, discarding every change the test made.
+    """
+
+    db_uri = f"file:test-{_WORKER_ID}-{uuid.uuid4().hex}?mode=memory&cache=shared"
+    connection = sqlite3.connect(db_uri, uri=True)
+    database_template.backup(connection)
+    monkeypatch.setattr(config, "DATABASE_PATH", db_uri)
     monkeypatch.setattr(config, "DATABASE_USER_ID", "fixture-user")
 
-    return db_path
+    yield connection
+    connection.close()
+
+
+@pytest.fixture(autouse=True)
+def clear_io_caches() -> None:
+    """Drop cached IO lookups so each test observes its own configuration.
+
+    Inputs: None.
+    Outputs: None; clears every memoised IO lookup before the test body runs.
+    """
+
+    io.invalidate_caches()
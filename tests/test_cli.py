@@ -11,6 +11,21 @@ import pytest
 from subject_recommender import cli
 from subject_recommender.sessions.generator import SessionPlan
 
+_PHYSICS_SCORES: dict[str, float] = {"Physics": 0.7}
+_NO_SCORES: dict[str, float] = {}
+
+
+def _stub_scores(_history: object) -> dict[str, float]:
+    """Return the shared single-subject normalised scores used by the CLI entry point tests."""
+
+    return _PHYSICS_SCORES
+
+
+def _stub_no_scores(_history: object) -> dict[str, float]:
+    """Return an empty normalised score mapping to exercise the unavailable-metrics branch."""
+
+    return _NO_SCORES
+
 
 def test_format_plan_lists_subjects_in_order() -> None:
     """Ensure `_format_plan` enumerates subjects when sessions exist.
@@ -19,7 +34,7 @@ def test_format_plan_lists_subjects_in_order() -> None:
     Outputs: Text containing ordered bullet lines referencing each subject once.
     """
 
-    plan = SessionPlan(subjects=["Maths", "History"], new_entries=[], history=[])
+    plan = SessionPlan(subjects=["Maths", "History"], revision_entries=[], penalty_entries=[], history=[])
 
     formatted = cli._format_plan(plan, shot_number=1)
 
@@ -35,7 +50,7 @@ def test_format_plan_handles_empty_sessions() -> None:
     Outputs: String informing the user that no sessions were scheduled.
     """
 
-    plan = SessionPlan(subjects=[], new_entries=[], history=[])
+    plan = SessionPlan(subjects=[], revision_entries=[], penalty_entries=[], history=[])
 
     assert cli._format_plan(plan) == "No study sessions scheduled."
 
@@ -43,7 +58,7 @@ def test_format_plan_handles_empty_sessions() -> None:
 def test_analyse_run_reports_frequency_and_patterns() -> None:
     """Ensure `analyse_run` captures frequency plus repeat positions."""
 
-    plans = [SessionPlan(subjects=["Maths", "Maths", "History"], new_entries=[], history=[])]
+    plans = [SessionPlan(subjects=["Maths", "Maths", "History"], revision_entries=[], penalty_entries=[], history=[])]
 
     analysis = cli.analyse_run(plans)
 
@@ -59,7 +74,9 @@ def test_analyse_run_reports_frequency_and_patterns() -> None:
 def test_format_analysis_mentions_recommendation(monkeypatch: pytest.MonkeyPatch) -> None:
     """Verify `_format_analysis` surfaces insights and config references."""
 
-    plans = [SessionPlan(subjects=["Physics", "Chemistry", "Physics"], new_entries=[], history=[])]
+    plans = [
+        SessionPlan(subjects=["Physics", "Chemistry", "Physics"], revision_entries=[], penalty_entries=[], history=[])
+    ]
     monkeypatch.setattr(cli.config, "SESSION_COUNT", 13)
     monkeypatch.setattr(
         cli.preprocessing,
@@ -79,7 +96,7 @@ def test_format_analysis_mentions_recommendation(monkeypatch: pytest.MonkeyPatch
 def test_format_analysis_handles_empty_run() -> None:
     """Ensure analysis formatter reports the absence of sessions."""
 
-    plans = [SessionPlan(subjects=[], new_entries=[], history=[])]
+    plans = [SessionPlan(subjects=[], revision_entries=[], penalty_entries=[], history=[])]
 
     assert "No sessions to analyse" in cli._format_analysis(plans)
 
@@ -91,8 +108,8 @@ def test_format_analysis_handles_missing_normalised_scores(monkeypatch: pytest.M
     Outputs: Summary string containing the basic insight lines.
     """
 
-    plans = [SessionPlan(subjects=["Physics"], new_entries=[], history=[])]
-    monkeypatch.setattr(cli.preprocessing, "calculate_normalised_scores", lambda _: {})
+    plans = [SessionPlan(subjects=["Physics"], revision_entries=[], penalty_entries=[], history=[])]
+    monkeypatch.setattr(cli.preprocessing, "calculate_normalised_scores", _stub_no_scores)
 
     summary = cli._format_analysis(plans)
 
@@ -103,10 +120,10 @@ def test_format_analysis_handles_missing_normalised_scores(monkeypatch: pytest.M
 def test_main_prints_plan_and_analysis(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
     """Confirm the CLI entry point prints both the plan and the insights."""
 
-    plan = SessionPlan(subjects=["Physics", "Chemistry"], new_entries=[], history=[])
+    plan = SessionPlan(subjects=["Physics", "Chemistry"], revision_entries=[], penalty_entries=[], history=[])
     monkeypatch.setattr(cli, "generate_session_plan", lambda **_: [plan])
     monkeypatch.setattr(cli.config, "SESSION_COUNT", 5)
-    monkeypatch.setattr(cli.preprocessing, "calculate_normalised_scores", lambda _: {"Physics": 0.7})
+    monkeypatch.setattr(cli.preprocessing, "calculate_normalised_scores", _stub_scores)
 
     cli.main([])
 
@@ -120,12 +137,12 @@ def test_main_handles_multiple_shots(monkeypatch: pytest.MonkeyPatch, capsys: py
     """Ensure the CLI prints each shot separately when multiple plans are generated."""
 
     plans = [
-        SessionPlan(subjects=["Physics"], new_entries=[], history=[]),
-        SessionPlan(subjects=["Chemistry"], new_entries=[], history=[]),
+        SessionPlan(subjects=["Physics"], revision_entries=[], penalty_entries=[], history=[]),
+        SessionPlan(subjects=["Chemistry"], revision_entries=[], penalty_entries=[], history=[]),
     ]
     monkeypatch.setattr(cli, "generate_session_plan", lambda **_: plans)
     monkeypatch.setattr(cli.config, "SESSION_COUNT", 5)
-    monkeypatch.setattr(cli.preprocessing, "calculate_normalised_scores", lambda _: {"Chemistry": 0.5})
+    monkeypatch.setattr(cli.preprocessing, "calculate_normalised_scores", _stub_scores)
 
     cli.main([])
 
@@ -142,10 +159,10 @@ def test_main_resets_history_when_flagged(monkeypatch: pytest.MonkeyPatch, capsy
     Outputs: Assertions confirming the filtered filename and the printed status message.
     """
 
-    plan = SessionPlan(subjects=["Physics"], new_entries=[], history=[])
+    plan = SessionPlan(subjects=["Physics"], revision_entries=[], penalty_entries=[], history=[])
     monkeypatch.setattr(cli, "generate_session_plan", lambda **_: [plan])
     monkeypatch.setattr(cli.config, "SESSION_COUNT", 3)
-    monkeypatch.setattr(cli.preprocessing, "calculate_normalised_scores", lambda _: {"Physics": 1.0})
+    monkeypatch.setattr(cli.preprocessing, "calculate_normalised_scores", _stub_scores)
 
     calls: dict[str, int] = {"count": 0}
 
@@ -169,7 +186,7 @@ def test_main_accepts_session_overrides(monkeypatch: pytest.MonkeyPatch, capsys:
     Outputs: Assertions covering propagated session defaults, shot count, and the configured user ID.
     """
 
-    plan = SessionPlan(subjects=["Biology"], new_entries=[], history=[])
+    plan = SessionPlan(subjects=["Biology"], revision_entries=[], penalty_entries=[], history=[])
     observed: dict[str, object] = {}
     monkeypatch.setattr(cli.config, "DATABASE_USER_ID", cli.config.DATABASE_USER_ID)
 
@@ -179,7 +196,7 @@ def test_main_accepts_session_overrides(monkeypatch: pytest.MonkeyPatch, capsys:
         return [plan]
 
     monkeypatch.setattr(cli, "generate_session_plan", fake_generate_session_plan)
-    monkeypatch.setattr(cli.preprocessing, "calculate_normalised_scores", lambda _: {"Biology": 1.0})
+    monkeypatch.setattr(cli.preprocessing, "calculate_normalised_scores", _stub_scores)
     cli.main(
         [
             "--session-count",
@@ -12,45 +12,39 @@ import pytest
 
 from subject_recommender import config, history_reset
 
+_COUNT_HISTORY_SQL = "SELECT COUNT(*) FROM history WHERE userID = ?;"
 
-def _count_history_entries() -> int:
+
+def _count_history_entries(connection: sqlite3.Connection) -> int:
     """Return the number of history rows for the configured user."""
-    connection = sqlite3.connect(config.DATABASE_PATH)
-    count = connection.execute(
-        "SELECT COUNT(*) FROM history WHERE userID = ?;",
-        (config.DATABASE_USER_ID,),
-    ).fetchone()[0]
-    connection.close()
-    return int(count)
+    return int(connection.execute(_COUNT_HISTORY_SQL, (config.DATABASE_USER_ID,)).fetchone()[0])
 
 
-def test_filter_history_removes_revision_and_not_studied() -> None:
+def test_filter_history_removes_revision_and_not_studied(temporary_database: sqlite3.Connection) -> None:
     """Ensure `filter_history` deletes excluded types for the configured user."""
 
-    connection = sqlite3.connect(config.DATABASE_PATH)
-    connection.execute(
+    temporary_database.execute(
         "INSERT INTO history (historyEntryID, userID, subjectID, typeID, score, studied_at) VALUES "
-        "('hist-extra-1', ?, 'sub-maths', 'type-revision', 5, '2025-01-02'),"
-        "('hist-extra-2', ?, 'sub-maths', 'type-not-studied', -2, '2025-01-03'),"
-        "('hist-extra-3', ?, 'sub-maths', 'type-quiz', 70, '2025-01-04');",
-        (config.DATABASE_USER_ID, config.DATABASE_USER_ID, config.DATABASE_USER_ID),
+        "('hist-extra-1', :uid, 'sub-maths', 'type-revision', 5, '2025-01-02'),"
+        "('hist-extra-2', :uid, 'sub-maths', 'type-not-studied', -2, '2025-01-03'),"
+        "('hist-extra-3', :uid, 'sub-maths', 'type-quiz', 70, '2025-01-04');",
+        {"uid": config.DATABASE_USER_ID},
     )
-    connection.commit()
-    connection.close()
+    temporary_database.commit()
 
     deleted = history_reset.filter_history()
 
     assert deleted == 2
-    assert _count_history_entries() == 2  # one existing seed + one quiz
+    assert _count_history_entries(temporary_database) == 2  # one existing seed + one quiz
 
 
-def test_main_reports_deleted_count(capsys: pytest.CaptureFixture[str]) -> None:
+def test_main_reports_deleted_count(capsys: pytest.CaptureFixture[str], temporary_database: sqlite3.Connection) -> None:
     """Ensure `main` prints the deleted row count."""
 
-    deleted_before = _count_history_entries()
+    deleted_before = _count_history_entries(temporary_database)
     history_reset.main()
     message = capsys.readouterr().out.strip()
 
     assert "Entries with type 'Revision' or 'Not Studied'" in message
     assert "records deleted" in message
-    assert _count_history_entries() <= deleted_before
+    assert _count_history_entries(temporary_database) <= deleted_before
@@ -1,35 +1,21 @@
 """Tests covering IO helper functions and their configuration bindings.
 
-Inputs: pytest fixtures (`monkeypatch`, `tmp_path`) alongside temporary SQLite data.
+Inputs: pytest fixtures (`monkeypatch`, `tmp_path`) alongside in-memory and temporary SQLite data.
 Outputs: Dict responses reflecting configuration values or parsed database records.
 """
 
 from __future__ import annotations
 
 import sqlite3
+import uuid
+from collections.abc import Callable, Iterator, Mapping
 from pathlib import Path
 
 import pytest
 
 from subject_recommender import config, io
 
-
-def _bootstrap_database(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, user_id: str = "user-1") -> Path:
-    """Create an isolated SQLite database with the required schema for tests.
-
-    Inputs:
-        monkeypatch (pytest.MonkeyPatch): Fixture used to override config values.
-        tmp_path (Path): Temporary directory root provided by pytest.
-        user_id (str): Identifier to assign to the seeded user.
-    Outputs:
-        Path pointing to the created database file with tables initialised.
-    """
-
-    db_path = tmp_path / "database.sqlite"
-    connection = sqlite3.connect(db_path)
-    connection.executescript(
-        """
-        PRAGMA foreign_keys = ON;
+_SCHEMA_SQL = """
         CREATE TABLE users (
             uuid TEXT PRIMARY KEY NOT NULL,
             username TEXT NOT NULL,
@@ -64,43 +50,79 @@ def _bootstrap_database(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, user_id
             FOREIGN KEY (typeID) REFERENCES types (uuid)
         );
         """
+
+BootstrapDatabase = Callable[[str], sqlite3.Connection]
+
+
+@pytest.fixture(scope="session")
+def schema_template() -> Iterator[sqlite3.Connection]:
+    """Build the IO test schema and assessment types once per session in a private in-memory database.
+
+    Inputs: None.
+    Outputs: Open connection to the template, which tests copy with `sqlite3.Connection.backup`.
+    """
+
+    connection = sqlite3.connect(":memory:")
+    connection.executescript(_SCHEMA_SQL)
+    connection.execute(
+        "INSERT INTO types (uuid, type, weight) VALUES (?, ?, ?), (?, ?, ?);",
+        ("type-quiz", "Quiz", 0.3, "type-exam", "Exam", 0.6),
     )
-    connection.execute("INSERT INTO users (uuid, username, role) VALUES (?, ?, ?);", (user_id, "tester", "student"))
-    connection.execute("INSERT INTO types (uuid, type, weight) VALUES ('type-quiz', 'Quiz', 0.3);")
-    connection.execute("INSERT INTO types (uuid, type, weight) VALUES ('type-exam', 'Exam', 0.6);")
     connection.commit()
+
+    yield connection
     connection.close()
 
-    monkeypatch.setattr(config, "DATABASE_PATH", db_path)
-    monkeypatch.setattr(config, "DATABASE_USER_ID", user_id)
 
-    return db_path
+def _clone_schema(template: sqlite3.Connection, connection: sqlite3.Connection, user_id: str) -> None:
+    """Copy the template into `connection` and seed the per-test user.
 
+    Inputs:
+        template (sqlite3.Connection): Session-wide `schema_template` connection.
+        connection (sqlite3.Connection): Open handle to an empty database.
+        user_id (str): Identifier to assign to the seeded user.
+    Outputs:
+        None; the copied tables and the user row are committed.
+    """
+
+    template.backup(connection)
+    connection.execute("INSERT INTO users (uuid, username, role) VALUES (?, ?, ?);", (user_id, "tester", "student"))
+    connection.commit()
 
-def test_get_assessment_weights_reflects_config() -> None:
-    """Ensure assessment weight lookups mirror config constants.
 
-    Inputs: None beyond imported configuration module.
-    Outputs: Dict mapping strings to floats matching config attributes.
+@pytest.fixture
+def bootstrap_database(
+    monkeypatch: pytest.MonkeyPatch, request: pytest.FixtureRequest, schema_template: sqlite3.Connection
+) -> BootstrapDatabase:
+    """Return a helper that creates an isolated in-memory SQLite database with the required schema.
+
+    Inputs:
+        monkeypatch (pytest.MonkeyPatch): Fixture used to override config values.
+        request (pytest.FixtureRequest): Used to close each holding connection after the test.
+        schema_template (sqlite3.Connection): Session-wide template copied into each new database.
+    Outputs:
+        Callable taking the user ID to seed and returning the open connection that holds the new
+        shared-cache database `config.DATABASE_PATH` now points at. Tests seed extra rows through it
+        rather than reopening; it is closed at teardown, which frees the database.
     """
 
-    weights = io.get_assessment_weights()
+    def bootstrap(user_id: str) -> sqlite3.Connection:
+        db_uri = f"file:bootstrap-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        holder = sqlite3.connect(db_uri, uri=True)
+        request.addfinalizer(holder.close)
+        _clone_schema(schema_template, holder, user_id)
 
-    for key, expected in {
-        "Revision": config.REVISION_WEIGHT,
-        "Homework": config.HOMEWORK_WEIGHT,
-        "Quiz": config.QUIZ_WEIGHT,
-        "Topic Test": config.TOPIC_TEST_WEIGHT,
-        "Mock Exam": config.MOCK_EXAM_WEIGHT,
-        "Exam": config.EXAM_WEIGHT,
-    }.items():
-        assert weights[key] == pytest.approx(expected)
+        monkeypatch.setattr(config, "DATABASE_PATH", db_uri)
+        monkeypatch.setattr(config, "DATABASE_USER_ID", user_id)
+        return holder
 
+    return bootstrap
 
-def test_append_history_entries_requires_existing_subjects(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+
+def test_append_history_entries_requires_existing_subjects(bootstrap_database: BootstrapDatabase) -> None:
     """Ensure appending history fails when subjects are missing from the database."""
 
-    _bootstrap_database(monkeypatch, tmp_path, user_id="user-123")
+    bootstrap_database("user-123")
     # Seed types but not subjects; helper already inserted types and user.
     entries = [{"subject": "Nonexistent", "type": "Quiz", "score": 10, "date": "2025-03-01"}]
 
@@ -108,82 +130,139 @@ def test_append_history_entries_requires_existing_subjects(monkeypatch: pytest.M
         io.append_history_entries(entries)
 
 
-def test_get_date_weighting_reflects_config() -> None:
-    """Verify date weighting boundaries mirror configuration values.
+@pytest.mark.parametrize(
+    ("getter", "expected_builder"),
+    [
+        pytest.param(
+            io.get_assessment_weights,
+            lambda: {
+                "Revision": pytest.approx(config.REVISION_WEIGHT),
+                "Homework": pytest.approx(config.HOMEWORK_WEIGHT),
+                "Quiz": pytest.approx(config.QUIZ_WEIGHT),
+                "Topic Test": pytest.approx(config.TOPIC_TEST_WEIGHT),
+                "Mock Exam": pytest.approx(config.MOCK_EXAM_WEIGHT),
+                "Exam": pytest.approx(config.EXAM_WEIGHT),
+            },
+            id="assessment_weights",
+        ),
+        pytest.param(
+            io.get_date_weighting,
+            lambda: {
+                "min_weight": float(config.DATE_WEIGHT_MIN),
+                "max_weight": float(config.DATE_WEIGHT_MAX),
+                "zero_day_threshold": int(config.DATE_WEIGHT_ZERO_DAY_THRESHOLD),
+            },
+            id="date_weighting",
+        ),
+        pytest.param(
+            io.get_session_defaults,
+            lambda: {
+                "count": config.SESSION_COUNT,
+                "session_time": config.SESSION_TIME_MINUTES,
+                "break_time": config.BREAK_TIME_MINUTES,
+                "shots": config.SHOTS,
+            },
+            id="session_defaults",
+        ),
+    ],
+)
+def test_getters_reflect_config(
+    getter: Callable[[], Mapping[str, object]], expected_builder: Callable[[], dict[str, object]]
+) -> None:
+    """Ensure configuration-backed IO getters mirror the config constants.
+
+    Inputs: IO getter plus a builder for the expected mapping, evaluated inside the test so the
+    config values are current; only the weight floats are wrapped in `pytest.approx`.
+    Outputs: Equality over the expected keys, since the seeded types table also holds "Not Studied".
+    """
+
+    expected = expected_builder()
+    actual = getter()
+
+    assert {key: actual[key] for key in expected} == expected
+
 
-    Inputs: None beyond imported configuration module.
-    Outputs: Dict containing minimum, maximum, and threshold values.
+def test_get_predicted_grades_reads_dataset(bootstrap_database: BootstrapDatabase) -> None:
+    """Ensure predicted grades load from SQLite for the configured user.
+
+    Inputs: Temporary SQLite database seeded with predicted grades for a single user.
+    Outputs: Dict mapping subject names to scores.
     """
 
-    weighting = io.get_date_weighting()
+    connection = bootstrap_database("user-123")
+    with connection:
+        connection.execute("INSERT INTO subjects (uuid, name) VALUES ('sub-1', 'Maths');")
+        connection.execute(
+            "INSERT INTO predictedGrades (predictedGradeID, userID, subjectID, score) VALUES (?, ?, ?, ?);",
+            ("pred-1", "user-123", "sub-1", 0.75),
+        )
 
-    assert weighting == {
-        "min_weight": float(config.DATE_WEIGHT_MIN),
-        "max_weight": float(config.DATE_WEIGHT_MAX),
-        "zero_day_threshold": int(config.DATE_WEIGHT_ZERO_DAY_THRESHOLD),
-    }
+    assert io.get_predicted_grades() == {"Maths": pytest.approx(0.75)}
 
 
-def test_get_session_defaults_reflects_config() -> None:
-    """Confirm session defaults mirror session-related config values.
+def test_get_predicted_grades_caches_query_per_database_and_user() -> None:
+    """Ensure repeated lookups reuse the cached query while handing out independent dicts.
 
-    Inputs: None beyond configuration state.
-    Outputs: Dict describing count and durations.
+    Inputs: The autouse fixture database seeded with one predicted grade for `fixture-user`.
+    Outputs: Assertions on the cache statistics and on mutation isolation between calls.
     """
 
-    defaults = io.get_session_defaults()
+    first = io.get_predicted_grades()
+    first["Maths"] = 0.0
+    second = io.get_predicted_grades()
 
-    assert defaults == {
-        "count": config.SESSION_COUNT,
-        "session_time": config.SESSION_TIME_MINUTES,
-        "break_time": config.BREAK_TIME_MINUTES,
-        "shots": config.SHOTS,
-    }
+    assert second == {"Maths": pytest.approx(0.5)}
+    assert io._load_predicted_grades.cache_info().hits == 1
 
 
-def test_get_predicted_grades_reads_dataset(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
-    """Ensure predicted grades load from SQLite for the configured user.
+def test_invalidate_caches_drops_memoised_lookups() -> None:
+    """Ensure `invalidate_caches` empties every memoised IO lookup.
 
-    Inputs: Temporary SQLite database seeded with predicted grades for a single user.
-    Outputs: Dict mapping subject names to scores.
+    Inputs: The autouse fixture database, read twice through the cached getters.
+    Outputs: Assertions that the second read hit the cache and that invalidation empties it.
     """
 
-    db_path = _bootstrap_database(monkeypatch, tmp_path, user_id="user-123")
-    connection = sqlite3.connect(db_path)
-    connection.execute("INSERT INTO subjects (uuid, name) VALUES ('sub-1', 'Maths');")
-    connection.execute(
-        "INSERT INTO predictedGrades (predictedGradeID, userID, subjectID, score) VALUES (?, ?, ?, ?);",
-        ("pred-1", "user-123", "sub-1", 0.75),
-    )
-    connection.commit()
-    connection.close()
+    io.get_assessment_weights()
+    io.get_assessment_weights()
+    io.get_predicted_grades()
+    assert io._load_assessment_weights.cache_info().hits == 1
 
-    assert io.get_predicted_grades() == {"Maths": pytest.approx(0.75)}
+    io.invalidate_caches()
 
+    assert io._load_assessment_weights.cache_info().currsize == 0
+    assert io._load_predicted_grades.cache_info().currsize == 0
 
-def test_get_predicted_grades_raises_for_empty_list(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
-    """Validate missing predicted grades raise `ValueError`."""
 
-    _bootstrap_database(monkeypatch, tmp_path, user_id="user-none")
+def test_get_session_defaults_reads_config_on_every_call(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensure session defaults pick up config overrides made after an earlier read."""
 
-    with pytest.raises(ValueError):
-        io.get_predicted_grades()
+    io.get_session_defaults()
+    monkeypatch.setattr(config, "SESSION_COUNT", config.SESSION_COUNT + 1)
+
+    assert io.get_session_defaults()["count"] == config.SESSION_COUNT
 
 
-def test_get_predicted_grades_raises_for_invalid_payload(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
-    """Legacy placeholder retained for compatibility; database loading cannot produce invalid payloads."""
+def test_get_predicted_grades_raises_for_empty_list(bootstrap_database: BootstrapDatabase) -> None:
+    """Validate missing predicted grades raise `ValueError`.
 
-    _bootstrap_database(monkeypatch, tmp_path, user_id="user-123")
+    Database loading cannot produce the malformed payloads the former JSON variants covered, so an
+    empty result is the only error path left to exercise.
+    """
+
+    bootstrap_database("user-none")
 
     with pytest.raises(ValueError):
         io.get_predicted_grades()
 
 
-def test_get_predicted_grades_supports_absolute_paths(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+def test_get_predicted_grades_supports_absolute_paths(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, schema_template: sqlite3.Connection
+) -> None:
     """Ensure database path resolution works with absolute paths."""
 
-    db_path = _bootstrap_database(monkeypatch, tmp_path, user_id="user-abs")
+    db_path = tmp_path / "database.sqlite"
     connection = sqlite3.connect(db_path)
+    _clone_schema(schema_template, connection, "user-abs")
     connection.execute("INSERT INTO subjects (uuid, name) VALUES ('sub-abs', 'History');")
     connection.execute(
         """INSERT INTO predictedGrades (predictedGradeID, userID, subjectID, score) 
@@ -191,27 +270,28 @@ def test_get_predicted_grades_supports_absolute_paths(monkeypatch: pytest.Monkey
     )
     connection.commit()
     connection.close()
+    monkeypatch.setattr(config, "DATABASE_PATH", db_path)
+    monkeypatch.setattr(config, "DATABASE_USER_ID", "user-abs")
 
     assert io.get_predicted_grades() == {"History": pytest.approx(0.95)}
 
 
-def test_get_study_history_reads_json_payload(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+def test_get_study_history_reads_json_payload(bootstrap_database: BootstrapDatabase) -> None:
     """Ensure study history loading parses DB rows into dictionaries."""
 
-    db_path = _bootstrap_database(monkeypatch, tmp_path, user_id="user-123")
-    connection = sqlite3.connect(db_path)
-    connection.execute("INSERT INTO subjects (uuid, name) VALUES ('sub-1', 'Maths');")
-    connection.execute("INSERT INTO subjects (uuid, name) VALUES ('sub-2', 'French');")
-    connection.execute(
-        "INSERT INTO history (historyEntryID, userID, subjectID, typeID, score, studied_at) VALUES (?, ?, ?, ?, ?, ?);",
-        ("hist-1", "user-123", "sub-1", "type-quiz", 65, "2025-03-02"),
-    )
-    connection.execute(
-        "INSERT INTO history (historyEntryID, userID, subjectID, typeID, score, studied_at) VALUES (?, ?, ?, ?, ?, ?);",
-        ("hist-2", "user-123", "sub-2", "type-exam", 72.5, "2025-03-01"),
-    )
-    connection.commit()
-    connection.close()
+    connection = bootstrap_database("user-123")
+    with connection:
+        connection.execute(
+            "INSERT INTO subjects (uuid, name) VALUES (?, ?), (?, ?);", ("sub-1", "Maths", "sub-2", "French")
+        )
+        connection.execute(
+            "INSERT INTO history (historyEntryID, userID, subjectID, typeID, score, studied_at) "
+            "VALUES (?, ?, ?, ?, ?, ?), (?, ?, ?, ?, ?, ?);",
+            (
+                *("hist-1", "user-123", "sub-1", "type-quiz", 65, "2025-03-02"),
+                *("hist-2", "user-123", "sub-2", "type-exam", 72.5, "2025-03-01"),
+            ),
+        )
 
     history = io.get_study_history()
 
@@ -221,18 +301,10 @@ def test_get_study_history_reads_json_payload(monkeypatch: pytest.MonkeyPatch, t
     assert history[1]["type"] == "Exam"
 
 
-def test_get_study_history_rejects_non_list_payload(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+def test_get_study_history_returns_empty_list_without_rows(bootstrap_database: BootstrapDatabase) -> None:
     """Ensure empty history returns an empty list instead of raising."""
 
-    _bootstrap_database(monkeypatch, tmp_path, user_id="user-empty")
-
-    assert io.get_study_history() == []
-
-
-def test_get_study_history_rejects_non_dict_entries(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
-    """Retain coverage for absence of history entries as a benign case."""
-
-    _bootstrap_database(monkeypatch, tmp_path, user_id="user-empty")
+    bootstrap_database("user-empty")
 
     assert io.get_study_history() == []
 
@@ -261,37 +333,29 @@ def test_get_assessment_weights_falls_back_when_types_missing(monkeypatch: pytes
     assert weights["Exam"] == pytest.approx(config.EXAM_WEIGHT)
 
 
-def test_get_type_map_returns_all_when_none(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+def test_get_type_map_returns_all_when_none(bootstrap_database: BootstrapDatabase) -> None:
     """Ensure `_get_type_map` returns all rows when no filter is provided."""
 
-    db_path = _bootstrap_database(monkeypatch, tmp_path, user_id="user-abc")
-    connection = sqlite3.connect(db_path)
-    connection.row_factory = sqlite3.Row
+    connection = bootstrap_database("user-abc")
     mapping = io._get_type_map(connection)  # type: ignore[attr-defined]
-    connection.close()
 
     assert mapping["Quiz"] == "type-quiz"
     assert mapping["Exam"] == "type-exam"
 
 
-def test_get_type_map_raises_for_missing(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+def test_get_type_map_raises_for_missing(bootstrap_database: BootstrapDatabase) -> None:
     """Ensure missing assessment types raise a ValueError."""
 
-    db_path = _bootstrap_database(monkeypatch, tmp_path, user_id="user-abc")
-    connection = sqlite3.connect(db_path)
-    connection.row_factory = sqlite3.Row
+    connection = bootstrap_database("user-abc")
     with pytest.raises(ValueError):
         io._get_type_map(connection, ["Quiz", "Project"])  # type: ignore[attr-defined]
-    connection.close()
 
 
-def test_get_subject_map_returns_empty_for_no_names(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+def test_get_subject_map_returns_empty_for_no_names(bootstrap_database: BootstrapDatabase) -> None:
     """Ensure subject map gracefully returns an empty mapping when no names supplied."""
 
-    db_path = _bootstrap_database(monkeypatch, tmp_path, user_id="user-abc")
-    connection = sqlite3.connect(db_path)
+    connection = bootstrap_database("user-abc")
     assert io._get_subject_map(connection, []) == {}  # type: ignore[attr-defined]
-    connection.close()
 
 
 def test_get_study_history_raises_when_user_missing(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
@@ -330,18 +394,45 @@ def test_append_history_entries_returns_zero_for_empty_entries() -> None:
     assert io.append_history_entries([]) == 0
 
 
-def test_append_history_entries_skips_incomplete_rows(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+def test_append_history_entries_writes_through_supplied_connection(
+    temporary_database: sqlite3.Connection,
+) -> None:
+    """Ensure a caller-held connection receives the rows inside its own open transaction."""
+
+    written = io.append_history_entries(
+        [{"subject": "Maths", "type": "Revision", "score": 75.0, "date": "2025-03-10"}],
+        connection=temporary_database,
+    )
+
+    assert written == 1
+    assert temporary_database.in_transaction
+    assert temporary_database.execute("SELECT COUNT(*) FROM history WHERE typeID = 'type-revision';").fetchone()[0] == 1
+
+
+def test_append_history_entries_skips_incomplete_rows(bootstrap_database: BootstrapDatabase) -> None:
     """Ensure entries lacking subject or type are ignored and do not write rows."""
 
-    db_path = _bootstrap_database(monkeypatch, tmp_path, user_id="fixture-user")
-    connection = sqlite3.connect(db_path)
-    connection.execute("INSERT INTO subjects (uuid, name) VALUES ('sub-maths', 'Maths');")
-    connection.execute("INSERT INTO types (uuid, type, weight) VALUES ('type-quiz-extra', 'Quiz', 0.3);")
-    connection.commit()
-    connection.close()
+    connection = bootstrap_database("fixture-user")
+    with connection:
+        connection.execute("INSERT INTO subjects (uuid, name) VALUES ('sub-maths', 'Maths');")
+        connection.execute("INSERT INTO types (uuid, type, weight) VALUES ('type-quiz-extra', 'Quiz', 0.3);")
     entries = [
         {"subject": "", "type": "Quiz", "score": 10, "date": "2025-03-01"},
         {"subject": "Maths", "type": "", "score": 11, "date": "2025-03-02"},
     ]
 
     assert io.append_history_entries(entries) == 0
+
+
+def test_open_connection_sets_only_connection_local_pragmas(tmp_path: Path) -> None:
+    """Ensure opening a database enforces foreign keys without converting its journal mode."""
+
+    connection = io._open_connection(tmp_path / "plain.sqlite")
+    try:
+        assert connection.execute("PRAGMA journal_mode;").fetchone()[0] == "delete"
+        assert connection.execute("PRAGMA foreign_keys;").fetchone()[0] == 1
+        assert connection.execute("PRAGMA synchronous;").fetchone()[0] == 1
+    finally:
+        connection.close()
+
+    assert not (tmp_path / "plain.sqlite-wal").exists()
@@ -92,26 +92,57 @@ def test_apply_weighting_uses_predictions_for_non_positive_scores(
     assert weighted_history["Art"]["weighted"] == pytest.approx(-5 * expected_art_weight)
 
 
+def test_apply_weighting_scales_dated_entries(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensure dated entries are scaled by the configured date decay.
+
+    Inputs: `monkeypatch` fixture overriding IO helpers and two dated Exam entries, one from today
+    and one older than the decay window.
+    Outputs: WeightedHistory weights reflecting the maximum and minimum date multipliers.
+    """
+
+    monkeypatch.setattr(weighting.io, "get_assessment_weights", lambda: {"Exam": 1.0})
+    monkeypatch.setattr(weighting.io, "get_predicted_grades", lambda: {"Maths": 0.5})
+    monkeypatch.setattr(
+        weighting.io,
+        "get_date_weighting",
+        lambda: {"min_weight": 0.25, "max_weight": 1.0, "zero_day_threshold": 30},
+    )
+
+    history = [
+        {"subject": "Maths", "score": 60, "type": "Exam", "date": date.today().isoformat()},
+        {"subject": "Physics", "score": 60, "type": "Exam", "date": "2000-01-01"},
+    ]
+
+    weighted_history = weighting.apply_weighting(history)
+
+    assert weighted_history["Maths"]["weight"] == pytest.approx(40 * 1.0)
+    assert weighted_history["Physics"]["weight"] == pytest.approx(40 * 0.25)
+
+
 def test_calculate_date_weight_covers_age_branches() -> None:
     """Ensure `_calculate_date_weight` clamps weights across date scenarios.
 
-    Inputs: Weighting configuration dictionary and multiple date strings covering future, recent,
-    threshold-exceeding, and invalid cases.
+    Inputs: Resolved weighting bounds and multiple date strings covering future, recent,
+    unpadded, threshold-exceeding, and invalid cases.
     Outputs: Floats reflecting maximum, scaled, minimum, and default weights respectively.
     """
 
     reference = date(2025, 6, 10)
-    weighting_config = {"min_weight": 0.2, "max_weight": 1.0, "zero_day_threshold": 10}
+    bounds = (0.2, 1.0, 10)
 
-    future_weight = weighting._calculate_date_weight("2025-06-15", weighting_config, reference)
-    recent_weight = weighting._calculate_date_weight("2025-06-05", weighting_config, reference)
-    old_weight = weighting._calculate_date_weight("2025-05-01", weighting_config, reference)
-    invalid_weight = weighting._calculate_date_weight("not-a-date", weighting_config, reference)
+    future_weight = weighting._calculate_date_weight("2025-06-15", reference, *bounds)
+    recent_weight = weighting._calculate_date_weight("2025-06-05", reference, *bounds)
+    old_weight = weighting._calculate_date_weight("2025-05-01", reference, *bounds)
+    unpadded_weight = weighting._calculate_date_weight("2025-6-5", reference, *bounds)
+    invalid_weight = weighting._calculate_date_weight("not-a-date", reference, *bounds)
+    invalid_month_weight = weighting._calculate_date_weight("2025-13-01", reference, *bounds)
 
-    assert future_weight == pytest.approx(weighting_config["max_weight"])
-    assert recent_weight < weighting_config["max_weight"]
-    assert old_weight == pytest.approx(weighting_config["min_weight"])
-    assert invalid_weight == pytest.approx(weighting_config["max_weight"])
+    assert future_weight == pytest.approx(1.0)
+    assert recent_weight < 1.0
+    assert old_weight == pytest.approx(0.2)
+    assert unpadded_weight == pytest.approx(recent_weight)
+    assert invalid_weight == pytest.approx(1.0)
+    assert invalid_month_weight == pytest.approx(1.0)
 
 
 def test_aggregate_scores_combines_defaults_and_results(
@@ -141,14 +172,23 @@ def test_aggregate_scores_combines_defaults_and_results(
     assert aggregated["History"] == pytest.approx(6.0)
 
 
-def test_normalise_scores_uses_io_predictions_when_missing_input(
+@pytest.mark.parametrize(
+    ("predicted_grades", "expected"),
+    [
+        pytest.param(None, {"Maths": 0.75, "French": 0.25}, id="io_predictions"),
+        pytest.param({"Biology": 0.0, "Chemistry": 0.0}, {"Biology": 0.0, "Chemistry": 0.0}, id="zero_total"),
+    ],
+)
+def test_normalise_scores(
     monkeypatch: pytest.MonkeyPatch,
+    predicted_grades: dict[str, float] | None,
+    expected: dict[str, float],
 ) -> None:
-    """Confirm normalisation pulls predictions from IO if not supplied.
+    """Confirm normalisation scales scores to sum to one and tolerates zero totals.
 
-    Inputs: `monkeypatch` fixture overriding `normalisation.io.get_predicted_grades`
-    to return a `Dict[str, float]`.
-    Outputs: Normalised `Dict[str, float]` whose probabilities sum to one.
+    Inputs: `monkeypatch` fixture overriding `normalisation.io.get_predicted_grades` (used when no
+    mapping is supplied) plus an optional explicit `Dict[str, float]`.
+    Outputs: Normalised `Dict[str, float]`; zero totals keep zero entries without division errors.
     """
 
     monkeypatch.setattr(
@@ -157,25 +197,7 @@ def test_normalise_scores_uses_io_predictions_when_missing_input(
         lambda: {"Maths": 3.0, "French": 1.0},
     )
 
-    normalised = normalisation.normalise_scores()
-
-    assert normalised["Maths"] == pytest.approx(0.75)
-    assert normalised["French"] == pytest.approx(0.25)
-    assert sum(normalised.values()) == pytest.approx(1.0)
-
-
-def test_normalise_scores_handles_zero_totals() -> None:
-    """Check normalisation gracefully handles zero totals.
-
-    Inputs: Explicit predictions dictionary with zero-valued floats.
-    Outputs: Normalised `Dict[str, float]` maintaining zero entries without division errors.
-    """
-
-    normalised = normalisation.normalise_scores({"Biology": 0.0, "Chemistry": 0.0})
-
-    assert normalised["Biology"] == pytest.approx(0.0)
-    assert normalised["Chemistry"] == pytest.approx(0.0)
-    assert sum(normalised.values()) == pytest.approx(0.0)
+    assert normalisation.normalise_scores(predicted_grades) == pytest.approx(expected)
 
 
 def test_choose_lowest_subject_returns_expected_choice() -> None:
@@ -6,197 +6,215 @@ Outputs: Assertions verifying plan subjects, appended entries, and persistence b
 
 from __future__ import annotations
 
+import random
 import sqlite3
-from pathlib import Path
+import sys
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
+from typing import Final
 
 import pytest
 
 from subject_recommender.sessions import generate_session_plan
 from subject_recommender.sessions import generator as generator_module
 
-
-def test_generate_session_plan_returns_schedule_and_entries(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    """Ensure explicitly supplied history and parameters produce deterministic output."""
-
-    history = [
-        {"subject": "Maths", "type": "Quiz", "score": 55, "date": "2025-03-01"},
-        {"subject": "Chemistry", "type": "Exam", "score": 78, "date": "2025-03-02"},
-    ]
-    session_parameters = {"count": 2, "session_time": 45, "break_time": 15}
-
-    monkeypatch.setattr(
-        generator_module.io,
-        "get_session_defaults",
-        lambda: {"count": 2, "session_time": 45, "break_time": 15, "shots": 1},
-    )
+_DEFAULT_SESSION_PARAMETERS: Final = MappingProxyType({"count": 1, "session_time": 30, "break_time": 5, "shots": 1})
+# Read-only history shared across cases; the generator copies entries before mutating them.
+_MATHS_QUIZ_HISTORY: Final = (
+    MappingProxyType({"subject": "Maths", "type": "Quiz", "score": 55, "date": "2025-03-01"}),
+)
+_STORED_HISTORY: Final = (MappingProxyType({"subject": "Biology", "type": "Quiz", "score": 60, "date": "2025-02-01"}),)
+_QUIZ_HOMEWORK_WEIGHTS: Final = MappingProxyType({"Quiz": 2.0, "Homework": 1.0})
+_ZERO_WEIGHT_WEIGHTS: Final = MappingProxyType({"Zero Weight": 0.0, "Quiz": 1.0})
+# Fixed expectations compare by value, so one approx object serves every assertion.
+_APPROX_ZERO: Final = pytest.approx(0.0)
+_APPROX_MATHS_PREDICTION: Final = pytest.approx(0.5666666, rel=1e-3)
+_APPROX_DECAYED_CHEMISTRY: Final = pytest.approx(0.395)
+
+
+@pytest.fixture(autouse=True)
+def default_io_stubs(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Stub the generator's IO reads and history write for every test in this module.
+
+    Inputs: `request` to honour the `real_io` marker and `monkeypatch` for the stubs.
+    Outputs: None; `get_session_defaults` returns `_DEFAULT_SESSION_PARAMETERS`,
+    `get_predicted_grades` returns `{}`, and `append_history_entries` writes nothing unless a test
+    overrides them or is marked `real_io`.
+    """
+
+    if request.node.get_closest_marker("real_io") is not None:
+        return
+    monkeypatch.setattr(generator_module.io, "get_session_defaults", lambda: _DEFAULT_SESSION_PARAMETERS)
     monkeypatch.setattr(generator_module.io, "get_predicted_grades", lambda: {})
-    monkeypatch.setattr(
-        generator_module,
-        "_initialise_local_scores",
-        lambda _: {"Physics": 0.1, "History": 0.2},
-    )
-    monkeypatch.setattr(generator_module, "_shuffle_subjects", lambda subjects: list(subjects))
-    persist_calls: list[list[dict[str, str | float]]] = []
-    monkeypatch.setattr(generator_module.io, "append_history_entries", lambda entries: persist_calls.append(entries))
-
-    plans = generate_session_plan(
-        history=history,
-        session_parameters=session_parameters,
-        session_date="2025-03-10",
-    )
-
-    assert len(plans) == 1
-    plan = plans[0]
-    assert plan.subjects == ["Physics", "History"]
-    assert len(plan.history) == len(history) + 4
-    revision_entries = [entry for entry in plan.new_entries if entry["type"] == "Revision"]
-    penalty_entries = [entry for entry in plan.new_entries if entry["type"] == "Not Studied"]
-    assert len(revision_entries) == 2
-    assert len(penalty_entries) == 2
-    assert any(entry["subject"] == "Maths" for entry in penalty_entries)
-    assert len(persist_calls) == 1
-
-
-def test_generate_session_plan_loads_history_and_defaults(
+    monkeypatch.setattr(generator_module.io, "append_history_entries", lambda entries: 0)
+
+
+_GENERATE_SESSION_PLAN_CASES: Final = [
+    pytest.param(
+        (*_MATHS_QUIZ_HISTORY, {"subject": "Chemistry", "type": "Exam", "score": 78, "date": "2025-03-02"}),
+        {"count": 2, "session_time": 45, "break_time": 15},
+        {"count": 2, "session_time": 45, "break_time": 15, "shots": 1},
+        {},
+        [{"Physics": 0.1, "History": 0.2}],
+        [["Physics", "History"]],
+        4,
+        id="explicit_arguments",
+    ),
+    pytest.param(
+        None,
+        None,
+        _DEFAULT_SESSION_PARAMETERS,
+        {"English Literature": 0.5},
+        [{"English Literature": 0.05, "Maths": 0.2}],
+        [["English Literature"]],
+        2,
+        id="io_history_and_defaults",
+    ),
+    pytest.param(
+        [{"subject": "Geography", "type": "Quiz", "score": 70, "date": "2025-01-15"}],
+        {"count": 1, "session_time": 60},
+        {"count": 3, "session_time": 40, "break_time": 10, "shots": 1},
+        {"Chemistry": 0.6},
+        [{"Chemistry": 0.05, "Geography": 0.5}],
+        [["Chemistry"]],
+        2,
+        id="partial_overrides",
+    ),
+    pytest.param(
+        _MATHS_QUIZ_HISTORY,
+        None,
+        {"count": 1, "session_time": 45, "break_time": 15, "shots": 2},
+        {},
+        [{"Physics": 0.1, "History": 0.2}, {"Physics": 0.6, "History": 0.4}],
+        [["Physics"], ["History"]],
+        2,
+        id="multiple_shots",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    (
+        "history",
+        "session_parameters",
+        "defaults",
+        "predicted",
+        "shot_scores",
+        "expected_subjects",
+        "expected_new_entries",
+    ),
+    _GENERATE_SESSION_PLAN_CASES,
+)
+def test_generate_session_plan(
     monkeypatch: pytest.MonkeyPatch,
+    history: Sequence[Mapping[str, str | float]] | None,
+    session_parameters: dict[str, int] | None,
+    defaults: Mapping[str, int],
+    predicted: dict[str, float],
+    shot_scores: Sequence[Mapping[str, float]],
+    expected_subjects: list[list[str]],
+    expected_new_entries: int,
 ) -> None:
-    """Verify the generator falls back to IO helpers when arguments are omitted."""
+    """Ensure plans follow the lowest local scores for explicit, IO-sourced, and partial inputs.
+
+    Inputs: Optional history and session overrides, stubbed IO defaults and predictions, and the
+    local scores served to each shot in turn.
+    Outputs: Assertions on each plan's subjects, first-plan history growth, the revision/penalty
+    split, and one persistence call per shot.
+    """
+
+    scores_per_shot = iter(shot_scores)
+    persist_calls: list[Sequence[dict[str, str | float]]] = []
+    # Patches are scoped to the generator call, so assertions run against the restored modules.
+    with monkeypatch.context() as patch:
+        for name, value in {
+            "get_study_history": lambda: _STORED_HISTORY,
+            "get_session_defaults": lambda: defaults,
+            "get_predicted_grades": lambda: predicted,
+            "append_history_entries": persist_calls.append,
+        }.items():
+            patch.setattr(generator_module.io, name, value)
+        # The generator decays local scores in place, so each shot gets a copy of the shared case data.
+        patch.setattr(generator_module, "_initialise_local_scores", lambda _: dict(next(scores_per_shot)))
+        patch.setattr(generator_module, "_shuffle_subjects", lambda subjects, rng: list(subjects))
+
+        plans = generate_session_plan(
+            history=history,
+            session_parameters=session_parameters,
+            session_date="2025-03-10",
+        )
+
+    assert [plan.subjects for plan in plans] == expected_subjects
+    assert len(plans[0].history) == len(history or _STORED_HISTORY) + expected_new_entries
+    history_subjects = {str(entry["subject"]) for entry in history or _STORED_HISTORY}
+    for plan in plans:
+        penalty_subjects = {entry["subject"] for entry in plan.penalty_entries}
+        assert [entry["type"] for entry in plan.revision_entries] == ["Revision"] * len(plan.subjects)
+        assert history_subjects - set(plan.subjects) <= penalty_subjects
+        assert penalty_subjects.isdisjoint(plan.subjects)
+        assert all(entry["type"] == "Not Studied" for entry in plan.penalty_entries)
+        assert plan.new_entries == plan.revision_entries + plan.penalty_entries
+    assert persist_calls == [plan.new_entries for plan in plans]
 
-    stored_history = [
-        {"subject": "Biology", "type": "Quiz", "score": 60, "date": "2025-02-01"},
-    ]
-    monkeypatch.setattr(generator_module.io, "get_study_history", lambda: stored_history)
-    monkeypatch.setattr(
-        generator_module.io,
-        "get_session_defaults",
-        lambda: {"count": 1, "session_time": 30, "break_time": 5, "shots": 1},
-    )
-    monkeypatch.setattr(
-        generator_module.io,
-        "get_predicted_grades",
-        lambda: {"English Literature": 0.5},
-    )
-    monkeypatch.setattr(
-        generator_module,
-        "_initialise_local_scores",
-        lambda _: {"English Literature": 0.05, "Maths": 0.2},
-    )
-    monkeypatch.setattr(generator_module.io, "append_history_entries", lambda entries: None)
 
-    plans = generate_session_plan(session_date="2025-04-01")
-
-    assert len(plans) == 1
-    plan = plans[0]
-    assert plan.subjects == ["English Literature"]
-    assert len(plan.history) == len(stored_history) + 2
-    assert any(entry["type"] == "Not Studied" for entry in plan.new_entries)
-
-
-def test_generate_session_plan_merges_partial_overrides(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    """Ensure missing override keys fall back to configuration defaults."""
-
-    history = [
-        {"subject": "Geography", "type": "Quiz", "score": 70, "date": "2025-01-15"},
-    ]
-    monkeypatch.setattr(
-        generator_module,
-        "_initialise_local_scores",
-        lambda _: {"Chemistry": 0.05, "Geography": 0.5},
-    )
-    monkeypatch.setattr(
-        generator_module.io,
-        "get_session_defaults",
-        lambda: {"count": 3, "session_time": 40, "break_time": 10, "shots": 1},
-    )
-    monkeypatch.setattr(generator_module.io, "get_predicted_grades", lambda: {"Chemistry": 0.6})
-    monkeypatch.setattr(generator_module.io, "append_history_entries", lambda entries: None)
-
-    plans = generate_session_plan(
-        history=history,
-        session_parameters={"count": 1, "session_time": 60},
-        session_date="2025-05-01",
-    )
+def test_run_single_plan_shuffles_subject_output(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensure subjects are shuffled before being stored on SessionPlan."""
 
-    assert len(plans) == 1
-    plan = plans[0]
-    assert plan.subjects == ["Chemistry"]
-    assert any(entry["type"] == "Not Studied" for entry in plan.new_entries)
+    sequence = iter(["A", "B"])
+    with monkeypatch.context() as patch:
+        patch.setattr(
+            generator_module.io,
+            "get_session_defaults",
+            lambda: {"count": 2, "session_time": 30, "break_time": 5, "shots": 1},
+        )
+        patch.setattr(generator_module.io, "get_predicted_grades", lambda: {"A": 0.6, "B": 0.4})
+        patch.setattr(generator_module, "_initialise_local_scores", lambda _: {"A": 0.1, "B": 0.2})
+        patch.setattr(
+            generator_module.preprocessing.normalisation,
+            "choose_lowest_subject",
+            lambda scores: next(sequence),
+        )
+        patch.setattr(generator_module, "_build_revision_entry", lambda **kwargs: {"type": "Revision", **kwargs})
+        patch.setattr(generator_module, "_build_not_studied_entries", lambda **kwargs: [])
+        patch.setattr(generator_module, "_shuffle_subjects", lambda subjects, rng: list(reversed(subjects)))
+
+        plans = generator_module.generate_session_plan(session_date="2025-03-10")
 
+    assert plans[0].subjects == ["B", "A"]
 
-def test_generate_session_plan_runs_multiple_shots(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    """Ensure the generator produces multiple plans when shots > 1."""
 
-    history = [
-        {"subject": "Maths", "type": "Quiz", "score": 55, "date": "2025-03-01"},
-    ]
-    monkeypatch.setattr(
-        generator_module.io,
-        "get_session_defaults",
-        lambda: {"count": 1, "session_time": 45, "break_time": 15, "shots": 2},
-    )
-    monkeypatch.setattr(generator_module.io, "get_predicted_grades", lambda: {})
+def test_generate_session_plan_shuffles_with_supplied_rng(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensure a seeded `random.Random` makes the shuffled subject output reproducible."""
 
-    shot_scores = iter(
-        [
-            {"Physics": 0.1, "History": 0.2},
-            {"Physics": 0.6, "History": 0.4},
-        ]
-    )
     monkeypatch.setattr(
         generator_module,
         "_initialise_local_scores",
-        lambda _: next(shot_scores),
+        lambda _: {"A": 0.1, "B": 0.2, "C": 0.3, "D": 0.4},
     )
+    parameters = {"count": 4, "session_time": 30, "break_time": 5, "shots": 1}
 
-    persist_calls: list[list[dict[str, str | float]]] = []
-    monkeypatch.setattr(
-        generator_module.io,
-        "append_history_entries",
-        lambda entries: persist_calls.append(list(entries)),
-    )
+    first = generate_session_plan(history=[], session_parameters=parameters, rng=random.Random(7))
+    second = generate_session_plan(history=[], session_parameters=parameters, rng=random.Random(7))
 
-    plans = generate_session_plan(history=history, session_date="2025-03-10")
+    assert first[0].subjects == second[0].subjects
+    assert sorted(first[0].subjects) == ["A", "B", "C", "D"]
 
-    assert len(plans) == 2
-    assert plans[0].subjects == ["Physics"]
-    assert plans[1].subjects == ["History"]
-    assert len(persist_calls) == 2
 
+def test_prepare_history_copies_entries_and_interns_labels() -> None:
+    """Ensure `_prepare_history` copies entries and interns subject and type strings."""
 
-def test_run_single_plan_shuffles_subject_output(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Ensure subjects are shuffled before being stored on SessionPlan."""
+    source = [
+        {"subject": "".join(["Ma", "ths"]), "type": "".join(["Qu", "iz"]), "score": 50},
+        {"subject": "".join(["Fren", "ch"]), "score": 40},
+    ]
 
-    monkeypatch.setattr(
-        generator_module.io,
-        "get_session_defaults",
-        lambda: {"count": 2, "session_time": 30, "break_time": 5, "shots": 1},
-    )
-    monkeypatch.setattr(generator_module.io, "get_predicted_grades", lambda: {"A": 0.6, "B": 0.4})
-    monkeypatch.setattr(generator_module, "_initialise_local_scores", lambda _: {"A": 0.1, "B": 0.2})
-    sequence = iter(["A", "B"])
-    monkeypatch.setattr(
-        generator_module.preprocessing.normalisation,
-        "normalise_scores",
-        lambda _: {"A": 0.4, "B": 0.6},
-    )
-    monkeypatch.setattr(
-        generator_module.preprocessing.normalisation,
-        "choose_lowest_subject",
-        lambda scores: next(sequence),
-    )
-    monkeypatch.setattr(generator_module.io, "append_history_entries", lambda entries: None)
-    monkeypatch.setattr(generator_module, "_build_revision_entry", lambda **kwargs: {"type": "Revision", **kwargs})
-    monkeypatch.setattr(generator_module, "_build_not_studied_entries", lambda **kwargs: [])
-    monkeypatch.setattr(generator_module, "_shuffle_subjects", lambda subjects: list(reversed(subjects)))
+    prepared = generator_module._prepare_history(source)
 
-    plans = generator_module.generate_session_plan(session_date="2025-03-10")
-    assert plans[0].subjects == ["B", "A"]
+    assert prepared == source
+    assert prepared[0] is not source[0]
+    assert prepared[0]["subject"] is sys.intern("Maths")
+    assert prepared[0]["type"] is sys.intern("Quiz")
+    assert "type" not in prepared[1]
 
 
 def test_initialise_local_scores_scales_aggregated_values(
@@ -232,16 +250,12 @@ def test_calculate_predicted_grades_from_history_scales_weighted_averages(
         {"subject": "French", "type": "Homework", "score": -10, "date": "2025-03-03"},
     ]
 
-    monkeypatch.setattr(
-        generator_module.io,
-        "get_assessment_weights",
-        lambda: {"Quiz": 2.0, "Homework": 1.0},
-    )
+    monkeypatch.setattr(generator_module.io, "get_assessment_weights", lambda: _QUIZ_HOMEWORK_WEIGHTS)
 
     predictions = generator_module._calculate_predicted_grades_from_history(history)
 
-    assert predictions["Maths"] == pytest.approx(0.5666666, rel=1e-3)
-    assert predictions["French"] == pytest.approx(0.0)
+    assert predictions["Maths"] == _APPROX_MATHS_PREDICTION
+    assert predictions["French"] == _APPROX_ZERO
 
 
 def test_calculate_predicted_grades_skips_empty_subjects_and_zero_weights(
@@ -254,57 +268,39 @@ def test_calculate_predicted_grades_skips_empty_subjects_and_zero_weights(
         {"subject": "Geography", "type": "Zero Weight", "score": 60},
     ]
 
-    monkeypatch.setattr(
-        generator_module.io,
-        "get_assessment_weights",
-        lambda: {"Zero Weight": 0.0, "Quiz": 1.0},
-    )
+    monkeypatch.setattr(generator_module.io, "get_assessment_weights", lambda: _ZERO_WEIGHT_WEIGHTS)
 
     predictions = generator_module._calculate_predicted_grades_from_history(history)
 
     assert "Geography" in predictions
-    assert predictions["Geography"] == pytest.approx(0.0)
+    assert predictions["Geography"] == _APPROX_ZERO
     assert "" not in predictions
 
 
-def test_adjust_local_scores_updates_subject_weights() -> None:
-    """Validate `_adjust_local_scores` mirrors AlgoTesting heuristics."""
-
-    scores = {"Maths": 0.2, "Chemistry": 0.5}
-
-    generator_module._adjust_local_scores(scores, "Maths", session_time=40, break_time=10)
-
-    assert scores["Maths"] > 0.2
-    assert scores["Chemistry"] == pytest.approx(0.495)
-
+@pytest.mark.parametrize(
+    ("session_time", "break_time", "expected_increase"),
+    [(40, 10, 0.55), (10, 9, 0.17), (180, 5, 2.275)],
+)
+def test_adjust_local_scores_scales_with_effective_minutes(
+    session_time: int, break_time: int, expected_increase: float
+) -> None:
+    """Ensure `_adjust_local_scores` bumps the studied subject by the effective study duration.
 
-def test_adjust_local_scores_scales_with_effective_minutes() -> None:
-    """Ensure `_adjust_local_scores` reacts to the effective study duration."""
+    Inputs: Session and break lengths fed through `_calculate_score_deltas`.
+    Outputs: Studied increase scaling with 2.5x session time plus break time, while every other
+    subject drops by the fixed 0.005 penalty.
+    """
 
-    short_scores = {"Maths": 0.3, "Chemistry": 0.4}
-    long_scores = {"Maths": 0.3, "Chemistry": 0.4}
+    scores = {"Maths": 0.3, "Chemistry": 0.4}
 
     generator_module._adjust_local_scores(
-        short_scores,
+        scores,
         "Maths",
-        session_time=10,
-        break_time=9,
+        *generator_module._calculate_score_deltas(session_time=session_time, break_time=break_time),
     )
-    generator_module._adjust_local_scores(
-        long_scores,
-        "Maths",
-        session_time=180,
-        break_time=5,
-    )
-
-    short_studied_increase = short_scores["Maths"] - 0.3
-    long_studied_increase = long_scores["Maths"] - 0.3
-    short_not_studied_drop = 0.4 - short_scores["Chemistry"]
-    long_not_studied_drop = 0.4 - long_scores["Chemistry"]
 
-    assert short_studied_increase < long_studied_increase
-    assert short_not_studied_drop == pytest.approx(long_not_studied_drop)
-    assert short_not_studied_drop == pytest.approx(0.005)
+    assert scores["Maths"] == pytest.approx(0.3 + expected_increase)
+    assert scores["Chemistry"] == _APPROX_DECAYED_CHEMISTRY
 
 
 def test_resolve_session_parameters_adds_default_shot(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -324,55 +320,84 @@ def test_resolve_session_parameters_adds_default_shot(monkeypatch: pytest.Monkey
 def test_persist_history_noops_on_empty(monkeypatch: pytest.MonkeyPatch) -> None:
     """Ensure `_persist_history` does not attempt DB writes when empty."""
 
-    calls: list[list[dict[str, str | float]]] = []
-    monkeypatch.setattr(generator_module.io, "append_history_entries", lambda entries: calls.append(list(entries)))
+    def fail_append(entries: object) -> int:
+        raise AssertionError("append_history_entries should not run for an empty list")
+
+    monkeypatch.setattr(generator_module.io, "append_history_entries", fail_append)
 
     generator_module._persist_history([])
 
-    assert calls == []
-
-
-def test_persist_history_writes_entries(tmp_path: Path) -> None:
-    """Ensure `_persist_history` inserts entries into the database."""
-
-    db_path = tmp_path / "db.sqlite"
-    connection = sqlite3.connect(db_path)
-    connection.executescript(
-        """
-        PRAGMA foreign_keys = ON;
-        CREATE TABLE users (uuid TEXT PRIMARY KEY NOT NULL, username TEXT NOT NULL, role TEXT NOT NULL);
-        CREATE TABLE subjects (uuid TEXT PRIMARY KEY NOT NULL, name TEXT NOT NULL);
-        CREATE TABLE types (uuid TEXT PRIMARY KEY NOT NULL, type TEXT NOT NULL, weight REAL NOT NULL);
-        CREATE TABLE history (
-            historyEntryID TEXT PRIMARY KEY NOT NULL,
-            userID TEXT NOT NULL,
-            subjectID TEXT NOT NULL,
-            typeID TEXT NOT NULL,
-            score REAL NOT NULL,
-            studied_at DATETIME NOT NULL
-        );
-        """
+
+@pytest.mark.real_io
+def test_persist_history_appends_to_seeded_history(temporary_database: sqlite3.Connection) -> None:
+    """Ensure `_persist_history` appends new entries after the seeded history.
+
+    Inputs: The autouse in-memory database, seeded with one history row for `fixture-user`.
+    Outputs: Assertion on the fixture user's history row count read through the same connection.
+    """
+
+    generator_module._persist_history([{"subject": "Maths", "type": "Revision", "score": 75.0, "date": "2025-03-10"}])
+
+    count = temporary_database.execute("SELECT COUNT(*) FROM history WHERE userID = 'fixture-user';").fetchone()[0]
+    assert count == 2
+
+
+def test_run_single_plan_selects_from_raw_local_scores(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensure session selection skips the normalisation pass while local scores sum positive."""
+
+    monkeypatch.setattr(generator_module, "_initialise_local_scores", lambda _: {"A": 3.0, "B": 1.0})
+
+    def fail_normalise(_: dict[str, float]) -> dict[str, float]:
+        raise AssertionError("normalise_scores should not run for a positive total")
+
+    monkeypatch.setattr(generator_module.preprocessing.normalisation, "normalise_scores", fail_normalise)
+
+    plans = generate_session_plan(
+        history=[],
+        session_parameters={"count": 1, "session_time": 30, "break_time": 5, "shots": 1},
+        session_date="2025-03-10",
     )
-    connection.execute("INSERT INTO users (uuid, username, role) VALUES ('user-a', 'tester', 'student');")
-    connection.execute("INSERT INTO subjects (uuid, name) VALUES ('sub-1', 'Maths');")
-    connection.execute("INSERT INTO types (uuid, type, weight) VALUES ('type-revision', 'Revision', 0.1);")
-    connection.commit()
-    connection.close()
 
-    # Patch config for this test DB
-    import subject_recommender.config as cfg  # local import to avoid fixture interference
+    assert plans[0].subjects == ["B"]
 
-    cfg.DATABASE_PATH = db_path  # type: ignore[attr-defined]
-    cfg.DATABASE_USER_ID = "user-a"  # type: ignore[attr-defined]
 
-    entries = [
-        {"subject": "Maths", "type": "Revision", "score": 75.0, "date": "2025-03-10"},
-    ]
+def test_run_single_plan_normalises_negative_local_score_totals(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensure a negative score total is normalised first, which reverses the raw ordering."""
 
-    generator_module.io.append_history_entries(entries)
+    monkeypatch.setattr(
+        generator_module,
+        "_initialise_local_scores",
+        lambda _: {"A": -0.3, "B": -0.1, "C": 0.05},
+    )
+
+    plans = generate_session_plan(
+        history=[],
+        session_parameters={"count": 1, "session_time": 30, "break_time": 5, "shots": 1},
+        session_date="2025-03-10",
+    )
+
+    assert plans[0].subjects == ["C"]
+
+
+def test_generate_session_plan_loads_predictions_once_per_shot(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensure each shot reads predicted grades once and shares them with revision and penalty entries."""
 
-    connection = sqlite3.connect(db_path)
-    count = connection.execute("SELECT COUNT(*) FROM history;").fetchone()[0]
-    connection.close()
+    calls: list[None] = []
 
-    assert count == 1
+    def counting_predictions() -> dict[str, float]:
+        calls.append(None)
+        return {"A": 0.6, "B": 0.4}
+
+    monkeypatch.setattr(generator_module.io, "get_predicted_grades", counting_predictions)
+    monkeypatch.setattr(generator_module, "_initialise_local_scores", lambda _: {"A": 0.1, "B": 0.2})
+
+    plans = generate_session_plan(
+        history=[],
+        session_parameters={"count": 1, "session_time": 30, "break_time": 5, "shots": 2},
+        session_date="2025-03-10",
+    )
+
+    assert len(plans) == 2
+    assert all(plan.penalty_entries for plan in plans)
+    # One read while collecting tracked subjects, then one per shot.
+    assert len(calls) == 3